@@ -0,0 +1,11 @@
+"""
+Shared tooling for the 2024 solutions.
+
+Every `dayNN.py` next to this package exposes `parse(text)`, `part1(data)`,
+`part2(data)` (where the day has a Part 2) and `solve(source=None)`, so the
+solvers can be imported, timed and reused in one process. Run them all with
+
+    python -m aoc2024 run --days 1-18
+
+from the `2024/python` directory.
+"""
@@ -0,0 +1,278 @@
+"""Command line entry point: `python -m aoc2024 <command>`."""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+from aoc2024 import (batch, bench, cache, daemon, differential, generate,
+                     runner, startup)
+
+
+def day_selection(spec):
+    """Parses a --days argument, reporting a bad one as a usage error."""
+    try:
+        return runner.parse_days(spec)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from None
+
+
+def cmd_run(args):
+    days = args.days
+    sources = [Path(p) for p in args.input] or [None]
+    jobs = [(day, source) for day in days for source in sources]
+    # Instrumented runs always solve from scratch, or there'd be nothing to
+    # measure, and so do runs of a particular engine.
+    instrumented = (args.phases or args.counters or args.memory
+                    or args.profile is not None)
+    use_cache = not (args.no_cache or instrumented or args.engine)
+    start = time.perf_counter()
+    results = []
+    for result in runner.run_jobs(
+            jobs, workers=args.jobs, use_cache=use_cache,
+            trace_memory=args.memory, record_phases=args.phases,
+            record_counters=args.counters, profile_dir=args.profile,
+            engine=args.engine):
+        print(runner.format_result(result))
+        for line in runner.format_details(result):
+            print(line)
+        results.append(result)
+    print(f"Total: {time.perf_counter() - start:.3f} s")
+    # The recorded timings are for scheduling the parts, not other engines.
+    if not (instrumented or args.engine):
+        runner.save_timings(results)
+    if use_cache:
+        cache.evict(args.cache_size * 2**20)
+    if args.json is not None:
+        with open(args.json, 'w') as f:
+            json.dump([result._asdict() for result in results], f, indent=1)
+
+
+def cmd_bench(args):
+    days = args.days
+    sources = [Path(p) for p in args.input] or [None]
+    jobs = [(day, source) for day in days for source in sources]
+    current = bench.run_benchmarks(jobs, repeat=args.repeat, warmup=args.warmup)
+    previous = bench.load_baseline(args.baseline)
+    lines, regressions = bench.compare(current, previous, args.threshold)
+    print("\n".join(lines))
+    if args.save:
+        bench.save_baseline(current, args.baseline)
+        print(f"Saved baseline to {args.baseline}")
+    if regressions:
+        print(f"{len(regressions)} phase(s) regressed by more than "
+              f"{args.threshold:.0%}")
+        return 1
+    return 0
+
+
+def cmd_batch(args):
+    paths = batch.expand_inputs(args.inputs)
+    start = time.perf_counter()
+    errors = 0
+    for record in batch.run_batch(args.day, paths, workers=args.jobs,
+                                  use_cache=args.cache):
+        print(json.dumps(record), flush=True)
+        errors += record["error"] is not None
+    elapsed = time.perf_counter() - start
+    rate = len(paths) / elapsed if elapsed else 0.0
+    print(f"Solved {len(paths)} input(s), {errors} error(s), in {elapsed:.3f} s "
+          f"({rate:.1f} inputs/s)", file=sys.stderr)
+    return 1 if errors else 0
+
+
+def cmd_generate(args):
+    if args.output is None:
+        sys.stdout.write(generate.generate(args.day, args.size, args.seed))
+    else:
+        generate.write(args.day, args.size, args.output, args.seed)
+
+
+def cmd_check(args):
+    mismatches = 0
+    for day in args.days:
+        if len(differential.engines(day)) < 2:
+            print(f"Day {day:02d} | one engine, nothing to check")
+            continue
+        report = differential.check_day(
+            day, [Path(p) for p in args.input], trials=args.trials,
+            size=args.size, seed=args.seed)
+        for line in differential.format_report(report):
+            print(line)
+        mismatches += len(report.mismatches)
+    return 1 if mismatches else 0
+
+
+def cmd_startup(args):
+    startups = [startup.measure(day) for day in args.days]
+    for s in startups:
+        print(startup.format_startup(s, args.top))
+    over = startup.check(startups, args.budget)
+    if over:
+        days = ", ".join(f"{s.day:02d}" for s in over)
+        print(f"Over the {args.budget:g} ms startup budget: day {days}")
+        return 1
+    return 0
+
+
+def cmd_serve(args):
+    print(f"Serving on {args.socket}")
+    daemon.serve(args.socket)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="aoc2024")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_cmd = commands.add_parser("run", help="solve days and time each part")
+    run_cmd.add_argument(
+        "--days", type=day_selection, default="1-18",
+        help="days to run, e.g. 1-18 or 1,3,5-7 (default: all)")
+    run_cmd.add_argument(
+        "--input", action="append", default=[], metavar="PATH",
+        help="input file to use instead of the stored input; repeat to run "
+             "each day on several inputs")
+    run_cmd.add_argument(
+        "-j", "--jobs", type=int, default=1, metavar="N",
+        help="worker processes to run jobs in parallel, 0 for one per CPU "
+             "(default: 1, in-process)")
+    run_cmd.add_argument(
+        "--engine", metavar="NAME",
+        help="solve with this engine from each day's ENGINES instead of the "
+             "parts, e.g. --days 1 --engine streaming for inputs too long "
+             "to fit in memory")
+    run_cmd.add_argument(
+        "--no-cache", action="store_true",
+        help="solve everything from scratch, neither reading nor writing the "
+             "answer cache (instrumented runs never use it)")
+    run_cmd.add_argument(
+        "--cache-size", type=int, default=cache.MAX_BYTES // 2**20,
+        metavar="MIB",
+        help="evict the least recently used cache entries beyond this size "
+             f"(default: {cache.MAX_BYTES // 2**20})")
+    run_cmd.add_argument(
+        "--phases", action="store_true",
+        help="record the time and calls of the phases the solvers mark")
+    run_cmd.add_argument(
+        "--counters", action="store_true",
+        help="record the work the solvers count (steps, states settled, "
+             "memo hits, ...)")
+    run_cmd.add_argument(
+        "--memory", action="store_true",
+        help="record the peak memory of each step with tracemalloc "
+             "(slows the solvers down)")
+    run_cmd.add_argument(
+        "--profile", type=Path, metavar="DIR",
+        help="profile each step with cProfile and dump the stats to DIR")
+    run_cmd.add_argument(
+        "--json", type=Path, metavar="PATH",
+        help="also write the results, with everything recorded, as JSON")
+    run_cmd.set_defaults(func=cmd_run)
+
+    bench_cmd = commands.add_parser(
+        "bench", help="benchmark days and compare against a baseline")
+    bench_cmd.add_argument(
+        "--days", type=day_selection, default="1-18",
+        help="days to benchmark (default: all)")
+    bench_cmd.add_argument(
+        "--input", action="append", default=[], metavar="PATH",
+        help="input file to benchmark on; repeat for several inputs")
+    bench_cmd.add_argument(
+        "--repeat", type=int, default=5,
+        help="timed trials per job (default: 5)")
+    bench_cmd.add_argument(
+        "--warmup", type=int, default=1,
+        help="untimed trials per job (default: 1)")
+    bench_cmd.add_argument(
+        "--baseline", type=Path, default=bench.BASELINE_PATH,
+        help="baseline file to compare against and save to")
+    bench_cmd.add_argument(
+        "--threshold", type=float, default=0.10,
+        help="fractional slowdown of a median that counts as a regression "
+             "(default: 0.10)")
+    bench_cmd.add_argument(
+        "--save", action="store_true",
+        help="store this run as the new baseline")
+    bench_cmd.set_defaults(func=cmd_bench)
+
+    batch_cmd = commands.add_parser(
+        "batch", help="solve many inputs for a day, writing JSON lines")
+    batch_cmd.add_argument("day", type=int, choices=runner.DAYS)
+    batch_cmd.add_argument(
+        "inputs", nargs="+", metavar="INPUT",
+        help="input files, directories of inputs, or glob patterns")
+    batch_cmd.add_argument(
+        "-j", "--jobs", type=int, default=1, metavar="N",
+        help="worker processes, 0 for one per CPU (default: 1, in-process)")
+    batch_cmd.add_argument(
+        "--cache", action="store_true",
+        help="use the answer cache (default: solve every input)")
+    batch_cmd.set_defaults(func=cmd_batch)
+
+    generate_cmd = commands.add_parser(
+        "generate", help="write a synthetic input for a day")
+    generate_cmd.add_argument("day", type=int, choices=runner.DAYS)
+    generate_cmd.add_argument(
+        "size", type=int,
+        help="input size; the unit depends on the day (lines for day 1, "
+             "grid side for day 6, digits for day 9, ...)")
+    generate_cmd.add_argument("--seed", type=int, default=0)
+    generate_cmd.add_argument(
+        "-o", "--output", type=Path,
+        help="file to write to (default: stdout)")
+    generate_cmd.set_defaults(func=cmd_generate)
+
+    check_cmd = commands.add_parser(
+        "check", help="check each day's engines against its reference solver")
+    check_cmd.add_argument(
+        "--days", type=day_selection, default="1-18",
+        help="days to check (default: all)")
+    check_cmd.add_argument(
+        "--input", action="append", default=[], metavar="PATH",
+        help="input file to check on as well as the stored input; repeat for "
+             "several inputs")
+    check_cmd.add_argument(
+        "--trials", type=int, default=10,
+        help="generated inputs to check on per day (default: 10)")
+    check_cmd.add_argument(
+        "--size", type=int, default=40,
+        help="largest size of the generated inputs, in the day's units "
+             "(default: 40)")
+    check_cmd.add_argument("--seed", type=int, default=0)
+    check_cmd.set_defaults(func=cmd_check)
+
+    startup_cmd = commands.add_parser(
+        "startup", help="report each day's cold-start import and first solve time")
+    startup_cmd.add_argument(
+        "--days", type=day_selection, default="1-18",
+        help="days to measure (default: all)")
+    startup_cmd.add_argument(
+        "--budget", type=float, default=startup.BUDGET_MS, metavar="MS",
+        help="fail if a day takes longer than this to import and solve once, "
+             f"besides importing NumPy (default: {startup.BUDGET_MS:g})")
+    startup_cmd.add_argument(
+        "--top", type=int, default=3, metavar="N",
+        help="slowest imports to list per day (default: 3)")
+    startup_cmd.set_defaults(func=cmd_startup)
+
+    serve_cmd = commands.add_parser(
+        "serve", help="keep the solvers warm and serve solves over a socket "
+                      "(query it with `python -m aoc2024.client`)")
+    serve_cmd.add_argument(
+        "--socket", type=Path, default=daemon.SOCKET_PATH, metavar="PATH",
+        help="Unix socket to listen on")
+    serve_cmd.set_defaults(func=cmd_serve)
+
+    args = parser.parse_args(argv)
+    if args.command == "run" and args.engine is not None:
+        try:
+            for day in args.days:
+                runner.day_engine(day, args.engine)
+        except ValueError as e:
+            run_cmd.error(str(e))
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
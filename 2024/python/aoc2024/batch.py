@@ -0,0 +1,68 @@
+"""
+Solves many inputs for one day and reports one JSON record per input.
+
+The inputs are solved in one process, so imports and other warm state are
+shared between them, or else spread over a process pool. Records stream out
+in the order the inputs were given, each with the answers and times, or with
+the error if the input failed, so one bad input doesn't stop the batch.
+"""
+
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+
+from aoc2024 import runner
+
+
+def expand_inputs(patterns):
+    """
+    Expands input directories (every file in them), glob patterns and plain
+    paths into a list of input paths, sorted within each pattern.
+    """
+    paths = []
+    for pattern in patterns:
+        path = Path(pattern)
+        if path.is_dir():
+            paths += sorted(p for p in path.iterdir() if p.is_file())
+        elif glob.has_magic(pattern):
+            paths += [Path(p) for p in sorted(glob.glob(pattern))]
+        else:
+            paths.append(path)
+
+    return paths
+
+
+def solve_input(day, path, use_cache=False):
+    """Solves one input and returns its record."""
+    record = {"day": day, "input": str(path)}
+    try:
+        result = runner.run_day(day, path, use_cache=use_cache)
+    except Exception as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+        return record
+
+    record["answers"] = result.answers
+    record["times"] = result.times
+    record["cached"] = result.cached
+    record["error"] = None
+    return record
+
+
+def run_batch(day, paths, workers=1, use_cache=False):
+    """
+    Solves each input path for the day and yields their records in order.
+    With more than one worker, the inputs are solved in a process pool.
+    """
+    solve = partial(solve_input, day, use_cache=use_cache)
+    if workers == 1:
+        yield from map(solve, paths)
+        return
+
+    workers = workers or os.cpu_count()
+    # Hand the inputs out in chunks so that small ones aren't dominated by
+    # the cost of passing them between processes.
+    chunksize = max(1, len(paths) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(solve, paths, chunksize=chunksize)
@@ -0,0 +1,121 @@
+"""
+Benchmarks the solvers against a stored baseline.
+
+Each (day, input) job is run once to warm up, then timed over repeated
+trials, then run once more with tracemalloc to record the peak memory of each
+phase, and the work counters of the solvers. Every phase ("parse", "part1",
+"part2") gets its median and 90th/99th percentile times, its peak memory and
+its counters, keyed "day:source:phase" in a JSON
+baseline file. A phase regresses if its median is slower than the baseline's
+by more than the threshold. Changed counters are reported alongside, since
+they tell a change in the work done apart from noise in the times.
+"""
+
+import json
+import math
+import platform
+import statistics
+import time
+
+from aoc2024 import runner
+
+
+BASELINE_PATH = runner.STATE_DIR / "baseline.json"
+
+
+def percentile(values, p):
+    """Returns the nearest-rank p-th percentile (0 < p <= 100) of values."""
+    ordered = sorted(values)
+    rank = math.ceil(p / 100 * len(ordered))
+    return ordered[max(rank, 1) - 1]
+
+
+def bench_job(day, source=None, repeat=5, warmup=1):
+    """Benchmarks one job and returns its stats per phase."""
+    for _ in range(warmup):
+        runner.run_day(day, source)
+    trials = [runner.run_day(day, source) for _ in range(repeat)]
+    traced = runner.run_day(day, source, trace_memory=True,
+                            record_counters=True)
+
+    stats = {}
+    for phase in trials[0].times:
+        times = [trial.times[phase] for trial in trials]
+        stats[phase] = {
+            "median": statistics.median(times),
+            "p90": percentile(times, 90),
+            "p99": percentile(times, 99),
+            "min": min(times),
+            "peak_bytes": traced.memory[phase],
+            "counters": traced.counters[phase],
+            "trials": repeat,
+        }
+
+    return stats
+
+
+def run_benchmarks(jobs, repeat=5, warmup=1):
+    """Benchmarks a list of (day, source) jobs and returns a baseline dict."""
+    entries = {}
+    for day, source in jobs:
+        source_key = str(source) if source is not None else "default"
+        for phase, stats in bench_job(day, source, repeat, warmup).items():
+            entries[f"{day}:{source_key}:{phase}"] = stats
+
+    return {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "entries": entries,
+    }
+
+
+def load_baseline(path=BASELINE_PATH):
+    """Returns the stored baseline, or None if there isn't one."""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def save_baseline(baseline, path=BASELINE_PATH):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(baseline, f, indent=1, sort_keys=True)
+
+
+def compare(current, previous, threshold=0.10):
+    """
+    Compares two baselines and returns a list of report lines along with the
+    keys of the phases whose medians regressed by more than the threshold
+    (a fraction, so 0.10 is 10% slower).
+    """
+    previous_entries = previous["entries"] if previous else {}
+    lines = []
+    regressions = []
+    for key, stats in current["entries"].items():
+        line = (f"{key:<40} median {stats['median'] * 1000:10.3f} ms  "
+                f"p90 {stats['p90'] * 1000:10.3f} ms  "
+                f"peak {stats['peak_bytes'] / 2**20:8.2f} MiB")
+        old = previous_entries.get(key)
+        if old is None:
+            line += "  (new)"
+        else:
+            delta = (stats["median"] - old["median"]) / old["median"] \
+                if old["median"] else 0.0
+            memory_delta = stats["peak_bytes"] - old["peak_bytes"]
+            line += f"  {delta:+7.1%} time  {memory_delta / 2**20:+8.2f} MiB"
+            if delta > threshold:
+                regressions.append(key)
+                line += "  REGRESSION"
+            # Baselines from before counters were recorded have none.
+            if "counters" in old:
+                changed = [f"{name} {old['counters'].get(name, 0):,} -> {n:,}"
+                           for name, n in stats["counters"].items()
+                           if n != old["counters"].get(name, 0)]
+                if changed:
+                    line += "  (" + ", ".join(changed) + ")"
+        lines.append(line)
+
+    return lines, regressions
@@ -0,0 +1,205 @@
+"""
+A content-addressed on-disk cache of answers and intermediate results.
+
+Entries are keyed by the day, a digest of the input's bytes and a digest of
+the solver's source (the day module plus the aoc2024 library), so editing
+either the input or the code invalidates them. Each entry is a directory
+holding the answers by part in answers.json and any named intermediates the
+solvers asked to keep: arrays as .npy files, anything else pickled.
+
+Solvers reach the cache through intermediate(), which is also how Part 2
+builds on Part 1's work: while a day runs on an input, the runner keeps
+either its entry or an in-memory Scratch active, so an intermediate is only
+computed once per run, and a day's solve() does the same with shared().
+Intermediates that are only worth sharing within a run, such as a memo that
+the parts keep adding to, are never written to an entry. Otherwise intermediate() just computes the value, so the parts still run on
+their own. Entries are evicted least recently used first once the cache grows
+over its size limit.
+"""
+
+import functools
+import os
+from contextlib import contextmanager
+
+from aoc2024.lazy import lazy_import
+
+# Only reading and writing entries needs these, and importing them all would
+# add tens of milliseconds to the start of every day.
+hashlib = lazy_import("hashlib")
+json = lazy_import("json")
+np = lazy_import("numpy")
+pathlib = lazy_import("pathlib")
+pickle = lazy_import("pickle")
+shutil = lazy_import("shutil")
+
+
+# Kept as strings, so that they don't load pathlib either.
+LIBRARY_DIR = os.path.dirname(os.path.realpath(__file__))
+CACHE_DIR = os.path.join(os.path.dirname(LIBRARY_DIR), ".aoc2024", "cache")
+MAX_BYTES = 256 * 2**20
+
+# The entry or Scratch that intermediate() stores to, set by scope().
+_active = None
+
+
+def digest(data):
+    """Returns the SHA-256 hex digest of a bytes-like buffer."""
+    return hashlib.sha256(data).hexdigest()
+
+
+@functools.cache
+def solver_version(day):
+    """Returns a digest of the day's source and the aoc2024 library's."""
+    h = hashlib.sha256()
+    library = pathlib.Path(LIBRARY_DIR)
+    paths = [library.parent / f"day{day:02d}.py"]
+    paths += sorted(library.glob("*.py"))
+    for path in paths:
+        h.update(path.read_bytes())
+    return h.hexdigest()
+
+
+def _write_atomic(path, write):
+    """Writes a file through a temporary one so readers never see it partial."""
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp, 'wb') as f:
+        write(f)
+    os.replace(tmp, path)
+
+
+class Entry:
+    """The cached answers and intermediates of one day on one input."""
+
+    def __init__(self, day, input_digest, root=CACHE_DIR):
+        version = solver_version(day)
+        self.path = (pathlib.Path(root) / f"day{day:02d}" /
+                     f"{input_digest[:16]}-{version[:16]}")
+        # Intermediates already loaded or computed in this process.
+        self._loaded = {}
+        if self.path.exists():
+            # Mark the entry as recently used for eviction.
+            os.utime(self.path)
+
+    def answers(self):
+        """Returns the stored answers by part, or {} if there are none."""
+        try:
+            with open(self.path / "answers.json") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def store_answer(self, part, answer):
+        """Stores a part's answer, which must be a plain JSON value."""
+        answers = self.answers()
+        answers[part] = answer
+        self.path.mkdir(parents=True, exist_ok=True)
+        _write_atomic(self.path / "answers.json",
+                      lambda f: f.write(json.dumps(answers).encode()))
+
+    def intermediate(self, name, compute, keep=True):
+        """
+        Returns the named intermediate, computing and storing it if needed.
+        If keep is false, it's only kept in memory, for this process.
+        """
+        if name in self._loaded:
+            return self._loaded[name]
+        if not keep:
+            self._loaded[name] = compute()
+            return self._loaded[name]
+
+        array_path = self.path / f"{name}.npy"
+        pickle_path = self.path / f"{name}.pickle"
+        if array_path.exists():
+            value = np.load(array_path)
+        elif pickle_path.exists():
+            with open(pickle_path, 'rb') as f:
+                value = pickle.load(f)
+        else:
+            value = compute()
+            self.path.mkdir(parents=True, exist_ok=True)
+            if isinstance(value, np.ndarray):
+                _write_atomic(array_path, lambda f: np.save(f, value))
+            else:
+                _write_atomic(pickle_path, lambda f: pickle.dump(value, f))
+
+        self._loaded[name] = value
+        return value
+
+
+class Scratch:
+    """The intermediates of one day on one input, kept in memory only."""
+
+    def __init__(self):
+        self._loaded = {}
+
+    def intermediate(self, name, compute, keep=True):
+        """Returns the named intermediate, computing it if needed."""
+        if name not in self._loaded:
+            self._loaded[name] = compute()
+        return self._loaded[name]
+
+
+@contextmanager
+def scope(entry):
+    """
+    Makes intermediate() use the given entry or Scratch (or no cache, if
+    None).
+    """
+    global _active
+    previous, _active = _active, entry
+    try:
+        yield entry
+    finally:
+        _active = previous
+
+
+@contextmanager
+def shared():
+    """
+    Makes intermediate() keep what it computes in a Scratch for the block,
+    unless an entry or Scratch is already active, for running both parts of
+    a day outside of the runner.
+    """
+    if _active is not None:
+        yield _active
+        return
+    with scope(Scratch()) as scratch:
+        yield scratch
+
+
+def intermediate(name, compute, keep=True):
+    """
+    Returns the result of compute(), reusing the one stored under the given
+    name in the active cache entry or Scratch if there is one. If keep is
+    false, an entry only holds on to it in memory, for the rest of the run.
+    """
+    if _active is None:
+        return compute()
+    return _active.intermediate(name, compute, keep)
+
+
+def evict(max_bytes=MAX_BYTES, root=CACHE_DIR):
+    """
+    Deletes the least recently used entries until the cache is no larger than
+    max_bytes. Returns the number of entries deleted.
+    """
+    entries = []
+    for path in pathlib.Path(root).glob("day*/*"):
+        size = sum(f.stat().st_size for f in path.iterdir())
+        entries.append((path.stat().st_mtime, size, path))
+    total = sum(size for _, size, _ in entries)
+
+    evicted = 0
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        shutil.rmtree(path, ignore_errors=True)
+        try:
+            path.parent.rmdir()
+        except OSError:
+            # The day still has other entries.
+            pass
+        total -= size
+        evicted += 1
+
+    return evicted
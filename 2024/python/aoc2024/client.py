@@ -0,0 +1,80 @@
+"""
+Thin client for the solver daemon: `python -m aoc2024.client`.
+
+This only imports the standard library modules it needs to talk to the
+socket, so that its own start-up stays small next to the warm solves.
+"""
+
+import argparse
+import json
+import os
+import socket
+import sys
+import time
+
+
+SOCKET_PATH = os.path.join(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))), ".aoc2024", "daemon.sock")
+
+
+def request(message, path=SOCKET_PATH):
+    """Sends a request to the daemon and yields each reply."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        s.connect(path)
+        s.sendall(json.dumps(message).encode() + b"\n")
+        # Tell the daemon that's the whole request.
+        s.shutdown(socket.SHUT_WR)
+        with s.makefile('rb') as replies:
+            for line in replies:
+                yield json.loads(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="aoc2024.client")
+    parser.add_argument(
+        "--days", default="1-18",
+        help="days to solve, e.g. 1-18 or 1,3,5-7 (default: all)")
+    parser.add_argument(
+        "--input", action="append", default=[], metavar="PATH",
+        help="input file to use instead of the stored input; repeat for "
+             "several inputs")
+    parser.add_argument(
+        "--cache", action="store_true",
+        help="let the daemon use the answer cache")
+    parser.add_argument(
+        "--socket", default=SOCKET_PATH, metavar="PATH",
+        help="the daemon's socket")
+    parser.add_argument(
+        "--stop", action="store_true", help="shut the daemon down")
+    args = parser.parse_args(argv)
+
+    if args.stop:
+        message = {"shutdown": True}
+    else:
+        # The daemon runs elsewhere, so send it absolute paths.
+        message = {"days": args.days,
+                   "inputs": [os.path.abspath(p) for p in args.input],
+                   "cache": args.cache}
+
+    start = time.perf_counter()
+    failed = False
+    try:
+        for reply in request(message, args.socket):
+            if "error" in reply:
+                failed = True
+                if "day" in reply:
+                    print(f"Day {reply['day']:02d} | {reply['source']}:",
+                          file=sys.stderr)
+                print(reply["error"], file=sys.stderr)
+            elif "summary" in reply:
+                print(reply["summary"])
+    except (FileNotFoundError, ConnectionRefusedError):
+        print(f"No daemon is listening on {args.socket}; start one with "
+              "`python -m aoc2024 serve`", file=sys.stderr)
+        return 1
+    print(f"Round trip: {(time.perf_counter() - start) * 1000:.1f} ms")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+"""
+Packed integer keys for sets and maps of grid coordinates.
+
+A coordinate (row, col) on a grid `width` columns wide is packed into the
+single int64 key row * width + col. One int hashes and compares much faster
+than a tuple, takes no allocation, and whole arrays of keys can be built and
+looked up at once with NumPy. A Grid's flat indexes are already packed keys,
+of its padded cells with width = stride.
+
+Since the keys of a grid are all below its size, sets and maps of them are
+kept as flat arrays indexed by key rather than as hash tables:
+
+- KeySet is a set of keys, as a bitmap.
+- KeyMap maps keys to ints, with a value for the keys it doesn't hold.
+
+Both take single keys from Python and arrays of keys in bulk.
+"""
+
+from aoc2024.lazy import lazy_import
+
+np = lazy_import("numpy")
+
+
+def pack(rows, cols, width):
+    """Returns the keys of (row, col) coordinates, as ints or arrays."""
+    return rows * width + cols
+
+
+def unpack(keys, width):
+    """Returns the (rows, cols) of keys, as ints or arrays."""
+    if isinstance(keys, int):
+        return divmod(keys, width)
+    return np.divmod(np.asarray(keys, dtype=np.int64), width)
+
+
+def in_bounds(rows, cols, shape):
+    """Returns whether each (row, col) lies within a grid of the shape."""
+    return (0 <= rows) & (rows < shape[0]) & (0 <= cols) & (cols < shape[1])
+
+
+class KeySet:
+    """A set of the keys below size."""
+
+    def __init__(self, size):
+        # The bitmap is a bytearray, which is fast to index one key at a
+        # time, viewed as a bool array, which is fast to index in bulk.
+        self._bytes = bytearray(size)
+        self.bits = np.frombuffer(self._bytes, dtype=bool)
+
+    def __contains__(self, key):
+        return bool(self._bytes[key])
+
+    def __len__(self):
+        return int(np.count_nonzero(self.bits))
+
+    def __iter__(self):
+        return iter(self.keys().tolist())
+
+    def add(self, key):
+        self._bytes[key] = True
+
+    def add_many(self, keys):
+        self.bits[np.asarray(keys, dtype=np.int64)] = True
+
+    def contains(self, keys):
+        """Returns a bool array of whether each of the keys is in the set."""
+        return self.bits[np.asarray(keys, dtype=np.int64)]
+
+    def keys(self):
+        """Returns the keys in the set as a sorted array."""
+        return np.flatnonzero(self.bits)
+
+
+class KeyMap:
+    """A map from the keys below size to ints, with missing for the rest."""
+
+    def __init__(self, size, missing=-1):
+        self.values = np.full(size, missing, dtype=np.int64)
+        self.missing = missing
+
+    @classmethod
+    def first_indexes(cls, keys, size, missing=-1):
+        """Maps each of the keys to the index of its first occurrence."""
+        first = cls(size, missing)
+        keys, indexes = np.unique(np.asarray(keys, dtype=np.int64),
+                                  return_index=True)
+        first.set_many(keys, indexes)
+        return first
+
+    def __contains__(self, key):
+        return self.values[key] != self.missing
+
+    def __getitem__(self, key):
+        return int(self.values[key])
+
+    def __setitem__(self, key, value):
+        self.values[key] = value
+
+    def get_many(self, keys):
+        """Returns an array of the values of the keys."""
+        return self.values[np.asarray(keys, dtype=np.int64)]
+
+    def set_many(self, keys, values):
+        self.values[np.asarray(keys, dtype=np.int64)] = values
@@ -0,0 +1,104 @@
+"""
+A long-lived worker that keeps the solvers warm between runs.
+
+A fresh run pays for the interpreter and its imports before solving anything,
+which is most of the run time of the fast days. The daemon imports every
+day, solves each once on its stored input to warm up NumPy and the code
+paths, and then serves requests over a Unix domain socket:
+
+    python -m aoc2024 serve &
+    python -m aoc2024.client --days 1,3 --input path/to/input.txt
+
+A request is one JSON line, {"days": "1,3", "inputs": [...], "cache": true},
+and the daemon answers with one JSON line per (day, input) job, holding the
+Result and its summary line, or an error. A request of {"shutdown": true}
+stops the daemon. Requests are served one at a time, since the solvers share
+module state such as the active cache entry.
+"""
+
+import json
+import os
+import socket
+import socketserver
+import threading
+import traceback
+from pathlib import Path
+
+from aoc2024 import runner
+
+
+SOCKET_PATH = runner.STATE_DIR / "daemon.sock"
+
+
+class Handler(socketserver.StreamRequestHandler):
+
+    def handle(self):
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+            except json.JSONDecodeError as e:
+                self.reply({"error": f"Bad request: {e}"})
+                continue
+            if request.get("shutdown"):
+                self.reply({"stopping": True})
+                # shutdown() waits for serve_forever() to return, so it
+                # can't be called from the thread that's serving.
+                threading.Thread(target=self.server.shutdown).start()
+                return
+            self.solve(request)
+
+    def solve(self, request):
+        try:
+            days = runner.parse_days(request.get("days", "1-18"))
+        except ValueError as e:
+            self.reply({"error": str(e)})
+            return
+        sources = [Path(p) for p in request.get("inputs", [])] or [None]
+        for day in days:
+            for source in sources:
+                try:
+                    result = runner.run_day(
+                        day, source, use_cache=request.get("cache", False))
+                except Exception:
+                    self.reply({"day": day,
+                                "source": None if source is None else str(source),
+                                "error": traceback.format_exc()})
+                    continue
+                self.reply({"result": result._asdict(),
+                            "summary": runner.format_result(result)})
+
+    def reply(self, message):
+        self.wfile.write(json.dumps(message).encode() + b"\n")
+        self.wfile.flush()
+
+
+def warm_up():
+    """Imports every day and solves it once on its stored input."""
+    for day in runner.DAYS:
+        runner.run_day(day)
+
+
+def is_running(path=SOCKET_PATH):
+    """Returns whether a daemon is listening on the socket."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        try:
+            s.connect(str(path))
+        except (FileNotFoundError, ConnectionRefusedError):
+            return False
+    return True
+
+
+def serve(path=SOCKET_PATH):
+    """Warms up and serves requests on the socket until shut down."""
+    if is_running(path):
+        raise RuntimeError(f"A daemon is already listening on {path}")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # A socket file left behind by a daemon that died.
+    path.unlink(missing_ok=True)
+
+    warm_up()
+    with socketserver.UnixStreamServer(str(path), Handler) as server:
+        try:
+            server.serve_forever()
+        finally:
+            os.unlink(path)
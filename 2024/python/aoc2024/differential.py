@@ -0,0 +1,175 @@
+"""
+Differential testing of a day's engines against its reference solver.
+
+A day that has more than one way to solve it lists them in an ENGINES dict,
+mapping each name to a function that takes an input (as solve() does) and
+returns the answers, with the reference engine first. Every engine is run on
+the same inputs, the stored one, any given ones and seeded generated ones,
+and its answers are checked against the reference's. The report gives each
+engine's total time and its speedup over the reference.
+
+An input the reference itself fails on is out of bounds and skipped. When an
+engine fails or answers differently, the input is shrunk, by dropping lines
+(and then characters, for one-line inputs) for as long as the engine still
+disagrees, and the smallest input found is saved for debugging.
+"""
+
+import re
+import time
+from collections import namedtuple
+
+from aoc2024 import generate, runner
+from aoc2024.inputs import input_path
+from aoc2024.lazy import lazy_import
+
+np = lazy_import("numpy")
+
+
+FAILURES_DIR = runner.STATE_DIR / "failures"
+
+Outcome = namedtuple("Outcome", ["answers", "error", "seconds"])
+Mismatch = namedtuple("Mismatch", ["engine", "input", "expected", "outcome",
+                                   "path"])
+Report = namedtuple("Report", ["day", "engines", "seconds", "inputs", "skipped",
+                               "mismatches"])
+
+
+def engines(day):
+    """
+    Returns the day's engines by name, reference first. A day without an
+    ENGINES dict has just the one, its solve().
+    """
+    module = runner.load_day(day)
+    return getattr(module, "ENGINES", {"solve": module.solve})
+
+
+def run_engine(engine, text):
+    """Runs an engine on input text and returns its Outcome."""
+    start = time.perf_counter()
+    try:
+        answers = tuple(runner.format_answer(answer) for answer in engine(text))
+    except Exception as e:
+        return Outcome(None, f"{type(e).__name__}: {e}",
+                       time.perf_counter() - start)
+    return Outcome(answers, None, time.perf_counter() - start)
+
+
+def disagrees(reference, engine, text):
+    """
+    Returns whether the engine fails or gives other answers on the text
+    where the reference succeeds.
+    """
+    expected = run_engine(reference, text)
+    if expected.error is not None:
+        return False
+    return run_engine(engine, text).answers != expected.answers
+
+
+def _reduce(units, fails):
+    """
+    Drops ever smaller runs of units for as long as what's left still fails,
+    and returns what's left (the complement steps of delta debugging).
+    """
+    n = 2
+    while len(units) >= 2:
+        size = -(-len(units) // n)
+        for start in range(0, len(units), size):
+            candidate = units[:start] + units[start + size:]
+            if fails(candidate):
+                units = candidate
+                n = max(n - 1, 2)
+                break
+        else:
+            if n >= len(units):
+                break
+            n = min(2 * n, len(units))
+
+    return units
+
+
+def shrink(text, fails):
+    """
+    Returns the smallest text found that still fails, by dropping lines and
+    then, if a single line is left, characters from it.
+    """
+    lines = _reduce(text.splitlines(keepends=True),
+                    lambda lines: fails(''.join(lines)))
+    if len(lines) != 1:
+        return ''.join(lines)
+
+    line = lines[0].rstrip('\n')
+    end = lines[0][len(line):]
+    chars = _reduce(list(line), lambda chars: fails(''.join(chars) + end))
+    return ''.join(chars) + end
+
+
+def inputs(day, paths=(), trials=10, size=40, seed=0):
+    """
+    Yields (name, text) for the stored input, the given paths, and trials
+    generated inputs of between half and all of the size.
+    """
+    yield "default", input_path(day).read_text()
+    for path in paths:
+        yield str(path), path.read_text()
+    sizes = np.random.default_rng(seed).integers(
+        max(size // 2, 1), size + 1, trials).tolist()
+    for trial, trial_size in enumerate(sizes):
+        trial_seed = seed + trial
+        yield (f"generated size {trial_size} seed {trial_seed}",
+               generate.generate(day, trial_size, trial_seed))
+
+
+def check_day(day, paths=(), trials=10, size=40, seed=0,
+              failures_dir=FAILURES_DIR):
+    """
+    Runs every engine for the day on the inputs and returns a Report, with
+    the total seconds of each engine over the inputs that weren't skipped.
+    """
+    named = engines(day)
+    names = list(named)
+    reference = named[names[0]]
+    seconds = dict.fromkeys(names, 0.0)
+    checked = skipped = 0
+    mismatches = []
+    for name, text in inputs(day, paths, trials, size, seed):
+        expected = run_engine(reference, text)
+        if expected.error is not None:
+            skipped += 1
+            continue
+        checked += 1
+        seconds[names[0]] += expected.seconds
+        for engine_name in names[1:]:
+            outcome = run_engine(named[engine_name], text)
+            seconds[engine_name] += outcome.seconds
+            if outcome.answers == expected.answers:
+                continue
+            smallest = shrink(text, lambda text: disagrees(
+                reference, named[engine_name], text))
+            slug = re.sub(r"\W+", "-", name).strip("-")
+            path = failures_dir / f"day{day:02d}-{engine_name}-{slug}.txt"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(smallest)
+            mismatches.append(Mismatch(engine_name, name, expected.answers,
+                                       outcome, path))
+
+    return Report(day, names, seconds, checked, skipped, mismatches)
+
+
+def format_report(report):
+    """Returns the lines summarizing a Report for the terminal."""
+    reference, *others = report.engines
+    cells = [f"Day {report.day:02d}",
+             f"{reference} {report.seconds[reference]:9.3f} s"]
+    for name in others:
+        speedup = (report.seconds[reference] / report.seconds[name]
+                   if report.seconds[name] else float('inf'))
+        cells.append(f"{name} {report.seconds[name]:9.3f} s {speedup:7.1f}x")
+    cells.append(f"{report.inputs} input(s), {report.skipped} skipped, "
+                 f"{len(report.mismatches)} mismatch(es)")
+    lines = [" | ".join(cells)]
+    for m in report.mismatches:
+        got = m.outcome.error or m.outcome.answers
+        lines.append(f"    {m.engine} on {m.input}: expected {m.expected}, "
+                     f"got {got}; smallest failing input saved to {m.path}")
+
+    return lines
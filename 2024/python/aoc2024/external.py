@@ -0,0 +1,93 @@
+"""
+Out-of-core sorting, for inputs with more values than fit in memory.
+
+Values are sorted a chunk at a time, and each sorted chunk is spilled to
+disk as a run in a .npy file. merge() then streams the values of all of the
+runs back in sorted order, memory-mapping the runs and reading a block from
+each at a time. The blocks share a buffer of a fixed number of values, so
+memory stays bounded however many values, and so runs, there are. Each run
+being merged holds a file descriptor, though, so when there are more than
+MAX_FAN_IN of them, combine() first merges them a group at a time into
+longer runs.
+"""
+
+from aoc2024.lazy import lazy_import
+
+np = lazy_import("numpy")
+
+
+# Values read from all of the runs together at a time when merging.
+MERGE_VALUES = 2**20
+# But at least this many from each run.
+MIN_BLOCK = 2**10
+# The most runs merged at once.
+MAX_FAN_IN = 128
+
+
+def spill(values, path):
+    """Sorts an array of values and writes it to path as a run. Returns path."""
+    np.save(path, np.sort(values))
+    return path
+
+
+def combine(paths, block=None):
+    """
+    Merges groups of the runs at the paths into longer runs, deleting them,
+    until there are at most MAX_FAN_IN runs to merge. Returns their paths.
+    """
+    paths = list(paths)
+    while len(paths) > MAX_FAN_IN:
+        paths = [_merge_into_run(paths[start:start + MAX_FAN_IN], block)
+                 for start in range(0, len(paths), MAX_FAN_IN)]
+    return paths
+
+
+def _merge_into_run(paths, block):
+    """Merges runs into one longer run, deleting them. Returns its path."""
+    runs = [np.load(path, mmap_mode='r') for path in paths]
+    merged_path = paths[0].with_name(f"{paths[0].stem}+{len(paths)}.npy")
+    merged = np.lib.format.open_memmap(
+        merged_path, mode='w+', dtype=runs[0].dtype,
+        shape=(sum(len(run) for run in runs),))
+    del runs
+    position = 0
+    for values in merge(paths, block):
+        merged[position:position + len(values)] = values
+        position += len(values)
+    merged.flush()
+    del merged
+    for path in paths:
+        path.unlink()
+    return merged_path
+
+
+def merge(paths, block=None):
+    """
+    Yields the values of the runs at the paths as sorted arrays, which
+    together hold every value in sorted order. Values are read block at a
+    time from each run, by default an equal share of MERGE_VALUES. There
+    should be at most MAX_FAN_IN runs; see combine().
+
+    A block is taken from the front of each run. Each run's later values
+    are at least the last of its block, so every value up to the smallest of
+    those lasts is in one of the blocks, and those values are merged and
+    yielded. The whole of the block with that smallest last value is among
+    them, so each round moves at least a block along.
+    """
+    runs = [run for run in (np.load(path, mmap_mode='r') for path in paths)
+            if len(run)]
+    if block is None:
+        block = max(MERGE_VALUES // max(len(runs), 1), MIN_BLOCK)
+    positions = [0] * len(runs)
+    while True:
+        blocks = [(k, runs[k][positions[k]:positions[k] + block])
+                  for k in range(len(runs)) if positions[k] < len(runs[k])]
+        if not blocks:
+            return
+        cutoff = min(values[-1] for _, values in blocks)
+        ready = []
+        for k, values in blocks:
+            n = int(np.searchsorted(values, cutoff, side='right'))
+            ready.append(values[:n])
+            positions[k] += n
+        yield np.sort(np.concatenate(ready))
@@ -0,0 +1,378 @@
+"""
+Seeded generators of synthetic puzzle inputs at arbitrary sizes.
+
+Each generator takes a size and a NumPy random Generator and yields the input
+text in chunks, so that very large inputs can be streamed to disk. What the
+size measures depends on the day (lines, grid side, digits, ...); see
+SIZE_UNITS. Generated inputs follow the puzzle formats and are built so the
+solvers terminate, e.g. day 6's guard always leaves the lab and day 14's
+robots always form a picture.
+"""
+
+from aoc2024.lazy import lazy_import
+
+np = lazy_import("numpy")
+
+
+CHUNK = 100_000
+
+SIZE_UNITS = {
+    1: "lines",
+    2: "reports",
+    3: "bytes",
+    4: "grid side",
+    5: "updates",
+    6: "grid side",
+    7: "equations",
+    8: "grid side",
+    9: "digits",
+    10: "grid side",
+    11: "stones",
+    12: "grid side",
+    13: "machines",
+    14: "robots",
+    15: "grid side",
+    16: "grid side",
+    17: "output values",
+    18: "bytes",
+}
+
+
+def _lines(rows):
+    """Joins an iterable of strings into newline-terminated chunks."""
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == CHUNK:
+            yield '\n'.join(batch) + '\n'
+            batch = []
+    if batch:
+        yield '\n'.join(batch) + '\n'
+
+
+def _grid(codes, alphabet):
+    """Yields the rows of an array of indexes into an alphabet as text."""
+    table = np.frombuffer(alphabet.encode(), dtype=np.uint8)
+    rows_per_chunk = max(CHUNK // (codes.shape[1] + 1), 1)
+    for start in range(0, len(codes), rows_per_chunk):
+        block = table[codes[start:start + rows_per_chunk]]
+        newlines = np.full((len(block), 1), ord('\n'), dtype=np.uint8)
+        yield np.hstack([block, newlines]).tobytes().decode()
+
+
+def day01(size, rng):
+    # A chunk is drawn at a time, so the lists can be longer than memory.
+    for start in range(0, size, CHUNK):
+        n = min(CHUNK, size - start)
+        left = rng.integers(10_000, 100_000, n)
+        # Draw some of the right list from the left so that Part 2 has matches.
+        right = rng.integers(10_000, 100_000, n)
+        shared = rng.random(n) < 0.5
+        right[shared] = rng.choice(left, shared.sum())
+        yield ''.join(f"{a}   {b}\n" for a, b in
+                      zip(left.tolist(), right.tolist()))
+
+
+def day02(size, rng):
+    def reports():
+        for _ in range(size):
+            n = int(rng.integers(5, 9))
+            steps = rng.integers(1, 4, n - 1) * (1 if rng.random() < 0.5 else -1)
+            levels = np.concatenate([[rng.integers(20, 80)], steps]).cumsum()
+            # Break about half of the reports, most of them with one bad level.
+            if rng.random() < 0.5:
+                levels[rng.integers(n)] += rng.integers(-4, 5)
+            yield ' '.join(map(str, levels.tolist()))
+
+    return _lines(reports())
+
+
+def day03(size, rng):
+    fragments = ["mul(", ")", ",", "(", "[", "]", "do()", "don't()", "don't",
+                 "mul ( 2 , 4 )", "mul(4*", "what()", "select()", "from()",
+                 "#", "!", "@", "^", "&", "+", "'", "<", ">", "?", " ", "\n"]
+    written = 0
+    while written < size:
+        pieces = []
+        for _ in range(CHUNK // 8):
+            r = rng.random()
+            if r < 0.3:
+                x, y = rng.integers(1, 1000, 2)
+                pieces.append(f"mul({x},{y})")
+            elif r < 0.35:
+                pieces.append(f"mul({rng.integers(1, 1000)},")
+            else:
+                pieces.append(fragments[rng.integers(len(fragments))])
+        chunk = ''.join(pieces)[:size - written]
+        written += len(chunk)
+        yield chunk
+
+
+def day04(size, rng):
+    return _grid(rng.integers(0, 4, (size, size)), "XMAS")
+
+
+def day05(size, rng, n_pages=49):
+    # Every pair of pages gets a rule, following one hidden total order.
+    order = rng.permutation(np.arange(10, 100))[:n_pages]
+    rules = [f"{order[i]}|{order[j]}"
+             for i in range(n_pages) for j in range(i + 1, n_pages)]
+    rules = [rules[i] for i in rng.permutation(len(rules))]
+    yield '\n'.join(rules) + '\n\n'
+
+    rank = {page: i for i, page in enumerate(order.tolist())}
+
+    def updates():
+        for _ in range(size):
+            n = 2 * int(rng.integers(2, 12)) + 1
+            pages = rng.choice(order, n, replace=False).tolist()
+            # About half of the updates are already in the right order.
+            if rng.random() < 0.5:
+                pages.sort(key=rank.get)
+            yield ','.join(map(str, pages))
+
+    yield from _lines(updates())
+
+
+def _guard_leaves(is_obstacle, start):
+    """Returns whether the guard walks out of the lab without looping."""
+    m, n = is_obstacle.shape
+    moves = [(-1, 0), (0, 1), (1, 0), (0, -1)]
+    x, y = start
+    direction = 0
+    seen = set()
+    while True:
+        state = (x, y, direction)
+        if state in seen:
+            return False
+        seen.add(state)
+        dx, dy = moves[direction]
+        if not (0 <= x + dx < m and 0 <= y + dy < n):
+            return True
+        if is_obstacle[x + dx, y + dy]:
+            direction = (direction + 1) % 4
+        else:
+            x, y = x + dx, y + dy
+
+
+def day06(size, rng, density=0.03):
+    # Redraw the map until the guard's patrol in Part 1 leaves the lab.
+    while True:
+        codes = (rng.random((size, size)) < density).astype(np.uint8)
+        start = tuple(rng.integers(0, size, 2).tolist())
+        codes[start] = 2
+        if _guard_leaves(codes == 1, start):
+            return _grid(codes, ".#^")
+
+
+def day07(size, rng):
+    def equations():
+        count = 0
+        while count < size:
+            n = int(rng.integers(2, 13))
+            nums = rng.integers(1, 1000, n)
+            nums[1:] = np.where(rng.random(n - 1) < 0.5,
+                                rng.integers(1, 10, n - 1), nums[1:])
+            nums = nums.tolist()
+            target = nums[0]
+            for num, op in zip(nums[1:], rng.integers(0, 3, n - 1).tolist()):
+                if op == 0:
+                    target += num
+                elif op == 1:
+                    target *= num
+                else:
+                    target = int(f"{target}{num}")
+            # Keep targets in int64 range.
+            if target >= 10 ** 18:
+                continue
+            # Knock about a third of the targets off so they can't calibrate.
+            if rng.random() < 1 / 3:
+                target += 1
+            count += 1
+            yield f"{target}: {' '.join(map(str, nums))}"
+
+    return _lines(equations())
+
+
+def day08(size, rng, density=0.05):
+    alphabet = "." + "0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    codes = np.where(rng.random((size, size)) < density,
+                     rng.integers(1, len(alphabet), (size, size)), 0)
+    return _grid(codes, alphabet)
+
+
+def day09(size, rng):
+    # The map alternates file and free space sizes and ends on a file.
+    size = size if size % 2 else size + 1
+    digits = rng.integers(0, 10, size)
+    digits[::2] = rng.integers(1, 10, len(digits[::2]))
+    for start in range(0, size, CHUNK):
+        chunk = digits[start:start + CHUNK] + ord('0')
+        yield chunk.astype(np.uint8).tobytes().decode()
+    yield '\n'
+
+
+def day10(size, rng):
+    # Heights climb diagonally with some noise, which gives plenty of trails.
+    i, j = np.indices((size, size))
+    heights = (i + j + (rng.random((size, size)) < 0.3)) % 10
+    return _grid(heights, "0123456789")
+
+
+def day11(size, rng):
+    stones = rng.integers(0, 1_000_000, size)
+    yield ' '.join(map(str, stones.tolist())) + '\n'
+
+
+def day12(size, rng, block=4):
+    # Plant random letters in blocks, then speckle them so plots get ragged.
+    coarse = rng.integers(0, 26, (size // block + 1, size // block + 1))
+    codes = np.kron(coarse, np.ones((block, block), dtype=int))[:size, :size]
+    noise = rng.random((size, size)) < 0.1
+    codes[noise] = rng.integers(0, 26, noise.sum())
+    return _grid(codes, "ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+
+
+def day13(size, rng):
+    def machines():
+        for _ in range(size):
+            while True:
+                ax, ay, bx, by = rng.integers(10, 100, 4).tolist()
+                if ax * by != ay * bx:
+                    break
+            a, b = rng.integers(0, 101, 2).tolist()
+            px, py = a * ax + b * bx, a * ay + b * by
+            # About half of the prizes can't be won.
+            if rng.random() < 0.5:
+                px += int(rng.integers(1, 10))
+            yield (f"Button A: X+{ax}, Y+{ay}\nButton B: X+{bx}, Y+{by}\n"
+                   f"Prize: X={px}, Y={py}\n")
+
+    return _lines(machines())
+
+
+def day14(size, rng, dims=None):
+    if dims is None:
+        # The real input's grid, grown in proportion once there'd be more
+        # than a robot for every two tiles, and kept odd so that there are
+        # middle rows and columns between the quadrants.
+        scale = max(1.0, (2 * size / (103 * 101)) ** 0.5)
+        dims = (int(103 * scale) | 1, int(101 * scale) | 1)
+    m, n = dims
+    size = min(size, m * n)
+    T = int(rng.integers(1, m * n))
+    vs = rng.integers(-100, 101, (size, 2))
+    # Hide a picture at time T by giving every robot its own tile then, and
+    # run the velocities backwards to get the starting positions.
+    final = np.column_stack(np.divmod(rng.choice(m * n, size, replace=False), n))
+    ps = (final - vs * T) % dims
+    rows = (f"p={p[1]},{p[0]} v={v[1]},{v[0]}"
+            for p, v in zip(ps.tolist(), vs.tolist()))
+    # The solver can't tell any other grid from the robots, so its size
+    # goes in a header line, (x, y) like the robots.
+    if dims != (103, 101):
+        yield f"size={n},{m}\n"
+    yield from _lines(rows)
+
+
+def day15(size, rng):
+    codes = np.zeros((size, size), dtype=np.uint8)
+    interior = rng.random((size - 2, size - 2))
+    codes[1:-1, 1:-1] = np.where(interior < 0.05, 1, np.where(interior < 0.25, 2, 0))
+    codes[[0, -1], :] = 1
+    codes[:, [0, -1]] = 1
+    codes[size // 2, size // 2] = 3
+    yield from _grid(codes, ".#O@")
+    yield '\n'
+    moves = np.frombuffer(b"<^>v", dtype=np.uint8)[
+        rng.integers(0, 4, 8 * size * size)]
+    yield from _lines(moves[i:i + 1000].tobytes().decode()
+                      for i in range(0, len(moves), 1000))
+
+
+def day16(size, rng, loops=0.05):
+    # Carve a maze over the odd tiles with a randomized depth-first search,
+    # then knock out some walls so that there are several best paths.
+    size = size if size % 2 else size + 1
+    codes = np.ones((size, size), dtype=np.uint8)
+    steps = [(0, 2), (2, 0), (0, -2), (-2, 0)]
+    is_wall = codes.tolist()
+    picks = iter(rng.random(size * size).tolist())
+    stack = [(size - 2, 1)]
+    is_wall[size - 2][1] = 0
+    # Keep the search out of the end's tile, or part of the maze could hang
+    # off the end and only be reachable through it.
+    is_wall[1][size - 2] = 0
+    while stack:
+        x, y = stack[-1]
+        options = [(x + dx, y + dy) for dx, dy in steps
+                   if 0 < x + dx < size - 1 and 0 < y + dy < size - 1
+                   and is_wall[x + dx][y + dy]]
+        if not options:
+            stack.pop()
+            continue
+        nx, ny = options[int(next(picks) * len(options))]
+        is_wall[(x + nx) // 2][(y + ny) // 2] = 0
+        is_wall[nx][ny] = 0
+        stack.append((nx, ny))
+    codes = np.array(is_wall, dtype=np.uint8)
+    inner = codes[1:-1, 1:-1]
+    inner[(inner == 1) & (rng.random(inner.shape) < loops)] = 0
+    # Open up the end so it can be reached both north-south and east-west.
+    codes[2, size - 2] = 0
+    codes[1, size - 3] = 0
+    codes[size - 2, 1] = 2
+    codes[1, size - 2] = 3
+    return _grid(codes, ".#SE")
+
+
+def day17(size, rng):
+    # The same loop as the real programs: each pass outputs one value from
+    # the low bits of A and then shifts A right by 3.
+    low = 8 ** (size - 1)
+    a = low + int.from_bytes(rng.bytes(3 * size // 8 + 1), 'big') % (7 * low)
+    x, y = rng.integers(1, 8, 2).tolist()
+    program = [2, 4, 1, x, 7, 5, 4, 5, 1, y, 5, 5, 0, 3, 3, 0]
+    yield (f"Register A: {a}\nRegister B: 0\nRegister C: 0\n\n"
+           f"Program: {','.join(map(str, program))}\n")
+
+
+def day18(size, rng):
+    # Corrupt about two thirds of the grid, like the real input.
+    side = max(int(np.ceil(np.sqrt(size / 0.68))), 8)
+    size = min(size, side * side - 2)
+    i, j = np.divmod(np.arange(side * side), side)
+    # Leave a random staircase path to the exit clear of the bytes that
+    # fall in Part 1, as many as day 18's parse() lets fall.
+    k_max = min(1024, size // 2)
+    down = rng.permutation(np.repeat([False, True], side - 1))
+    on_path = np.zeros(side * side, dtype=bool)
+    on_path[np.concatenate([[0], down.cumsum()]) * side
+            + np.concatenate([[0], (~down).cumsum()])] = True
+    # Every path to the exit crosses the antidiagonal, so corrupting all of
+    # it makes sure that the exit gets cut off in the end.
+    is_cut = i + j == side - 1
+    is_corner = (i + j == 0) | (i + j == 2 * (side - 1))
+    cells = rng.permutation(side * side)
+    is_early = ~(on_path | is_cut | is_corner)[cells]
+    early = cells[is_early][:k_max]
+    rest = np.setdiff1d(cells[~is_corner[cells] & ~is_cut[cells]], early)
+    rest = rng.permutation(rest)[:max(size - len(early) - side, 0)]
+    late = rng.permutation(np.concatenate([np.flatnonzero(is_cut), rest]))
+    x, y = np.divmod(np.concatenate([early, late]), side)
+    return _lines(f"{j},{i}" for i, j in zip(x.tolist(), y.tolist()))
+
+
+GENERATORS = {day: globals()[f"day{day:02d}"] for day in SIZE_UNITS}
+
+
+def generate(day, size, seed=0):
+    """Returns a generated input for the given day as text."""
+    return ''.join(GENERATORS[day](size, np.random.default_rng(seed)))
+
+
+def write(day, size, path, seed=0):
+    """Streams a generated input for the given day to a file."""
+    with open(path, 'w') as f:
+        for chunk in GENERATORS[day](size, np.random.default_rng(seed)):
+            f.write(chunk)
@@ -0,0 +1,101 @@
+"""
+A compact character grid shared by the grid days.
+
+Tiles are stored one byte each in a uint8 array parsed straight from the
+input's bytes, instead of one 4-byte unicode string per tile. The grid can be
+padded with a sentinel border so that stepping off the map lands on the
+sentinel rather than out of bounds, and then every tile has the same flat
+index offsets to its neighbors: with `stride` bytes per padded row, the tile
+above index i is i - stride, the one to the right is i + 1, and so on.
+"""
+
+from aoc2024.inputs import char_grid
+from aoc2024.lazy import lazy_import
+
+np = lazy_import("numpy")
+
+
+# Never appears in puzzle input, so it's safe to use as the border sentinel.
+SENTINEL = 0
+
+
+class Grid:
+    """
+    A 2D grid of byte tiles. `cells` is the padded array, `pad` the width of
+    the sentinel border around the original `shape`.
+    """
+
+    def __init__(self, cells, pad=0):
+        self.cells = np.ascontiguousarray(cells, dtype=np.uint8)
+        self.pad = pad
+        self.shape = (self.cells.shape[0] - 2 * pad,
+                      self.cells.shape[1] - 2 * pad)
+        self.stride = self.cells.shape[1]
+        # Flat offsets to the 4-adjacent tiles, clockwise from north.
+        self.offsets = (-self.stride, 1, self.stride, -1)
+        # Flat offsets to all 8 surrounding tiles, clockwise from north.
+        self.offsets8 = (-self.stride, -self.stride + 1, 1, self.stride + 1,
+                         self.stride, self.stride - 1, -1, -self.stride - 1)
+
+    @classmethod
+    def from_array(cls, array, pad=0, border=SENTINEL):
+        """Wraps a 2D array of byte codes, padding it with the border value."""
+        cells = np.asarray(array, dtype=np.uint8)
+        if pad:
+            cells = np.pad(cells, pad, constant_values=border)
+        return cls(cells, pad)
+
+    @classmethod
+    def from_text(cls, data, pad=0, border=SENTINEL):
+        """
+        Parses newline-separated rows of equal width from a str or a buffer.
+        Blank lines around the grid are ignored.
+        """
+        return cls.from_array(char_grid(data), pad, border)
+
+    @property
+    def flat(self):
+        """The padded cells as a 1D view, indexed by flat index."""
+        return self.cells.reshape(-1)
+
+    @property
+    def view(self):
+        """The cells without the border, as a 2D view."""
+        p = self.pad
+        return self.cells[p:p + self.shape[0], p:p + self.shape[1]]
+
+    def index(self, row, col):
+        """Returns the flat index of the tile at (row, col) of the unpadded grid."""
+        return (row + self.pad) * self.stride + col + self.pad
+
+    def position(self, index):
+        """Returns the (row, col) of a flat index in the unpadded grid."""
+        row, col = divmod(int(index), self.stride)
+        return row - self.pad, col - self.pad
+
+    def positions(self, indexes):
+        """Vectorized position: returns arrays of rows and cols."""
+        rows, cols = np.divmod(np.asarray(indexes), self.stride)
+        return rows - self.pad, cols - self.pad
+
+    def mask(self, chars):
+        """Returns a boolean array over the padded cells of the given tiles."""
+        codes = np.frombuffer(chars.encode(), dtype=np.uint8)
+        if len(codes) == 1:
+            return self.cells == codes[0]
+        return np.isin(self.cells, codes)
+
+    def find(self, chars):
+        """Returns the flat indexes of every tile that is one of chars."""
+        return np.flatnonzero(self.mask(chars))
+
+    def first(self, char):
+        """Returns the flat index of the first tile that is char."""
+        return int(np.argmax(self.flat == ord(char)))
+
+    def tobytes(self):
+        """
+        Returns the padded cells as bytes, which are much faster than the
+        array to index one tile at a time from Python.
+        """
+        return self.cells.tobytes()
@@ -0,0 +1,211 @@
+"""
+Locating, loading and bulk-parsing puzzle inputs.
+
+Inputs are memory-mapped rather than read into Python strings, and the
+parsers work on the raw bytes with NumPy, so large inputs never turn into
+millions of per-line strings. Every parser also accepts a str, which is handy
+for trying out a solver on a pasted example.
+"""
+
+import mmap
+import os
+
+from aoc2024.lazy import lazy_import
+
+np = lazy_import("numpy")
+pathlib = lazy_import("pathlib")
+
+
+# Kept as a string, so that importing this doesn't load pathlib.
+INPUT_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.realpath(__file__)))),
+    "_tests")
+
+# ints() parses this many bytes at a time.
+INTS_CHUNK = 2**18
+
+# The most decimal digits that always fit in an int64.
+_MAX_DIGITS = 18
+_NEWLINE = ord('\n')
+
+
+def input_path(day):
+    """Returns the path to the stored input for the given day."""
+    return pathlib.Path(_stored_input(day))
+
+
+def _stored_input(day):
+    # As a string, since map_input() only needs to open it.
+    return os.path.join(INPUT_DIR, f"day{day:02d}.txt")
+
+
+def map_input(source, day):
+    """
+    Returns the puzzle input as a read-only bytes-like buffer. The source is
+    either the text itself (a str), a path-like object to map, or None to map
+    the day's stored input.
+    """
+    if isinstance(source, str):
+        return source.encode()
+    with open(_stored_input(day) if source is None else source, 'rb') as f:
+        try:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files can't be mapped.
+            return b''
+
+
+def as_bytes(data):
+    """Returns a NumPy uint8 view of a buffer, encoding it first if a str."""
+    if isinstance(data, str):
+        data = data.encode()
+    return np.frombuffer(data, dtype=np.uint8)
+
+
+def as_text(data):
+    """Decodes a buffer to a str, for the days that parse their input as text."""
+    if isinstance(data, str):
+        return data
+    return bytes(data).decode()
+
+
+def ints(data, lines=False):
+    """
+    Extracts every signed integer from the buffer as an int64 array. If lines
+    is set, also returns the (0-based) line number that each integer is on.
+
+    Integers are found as runs of digits, optionally preceded by '-', and
+    evaluated by Horner's rule over all runs at once, one digit position at a
+    time, so no per-digit or per-line Python objects are created. Large
+    buffers are worked through about INTS_CHUNK bytes at a time, split
+    between integers, so that the temporaries don't grow with the input.
+    """
+    values = []
+    line_numbers = []
+    line = 0
+    for chunk in _int_chunks(as_bytes(data), INTS_CHUNK):
+        chunk_values, starts = _chunk_ints(chunk)
+        values.append(chunk_values)
+        if lines:
+            newlines = np.flatnonzero(chunk == _NEWLINE)
+            line_numbers.append(np.searchsorted(newlines, starts) + line)
+            line += len(newlines)
+
+    values = values[0] if len(values) == 1 else np.concatenate(values)
+    if lines:
+        if len(line_numbers) == 1:
+            return values, line_numbers[0]
+        return values, np.concatenate(line_numbers)
+    return values
+
+
+def _int_chunks(a, size):
+    """
+    Splits a uint8 array into views of about size bytes, each ending just
+    before a byte that can't be part of an integer or its sign, so that no
+    integer is split between chunks. There's always at least one chunk.
+    """
+    start = 0
+    while len(a) - start > size:
+        end = start + size
+        while end < len(a):
+            window = a[end:end + 64]
+            part = (window - ord('0') < 10) | (window == ord('-'))
+            if not part.all():
+                end += int(np.argmin(part))
+                break
+            end += len(window)
+        yield a[start:end]
+        start = end
+    yield a[start:]
+
+
+def _chunk_ints(a):
+    """
+    Returns the integers in a uint8 array that ints() works on at once, and
+    the offsets at which their digits start.
+    """
+    digits = a - ord('0')
+    is_digit = digits < 10
+    edges = np.diff(is_digit.view(np.int8), prepend=0, append=0)
+    starts = np.flatnonzero(edges == 1)
+    lengths = np.flatnonzero(edges == -1) - starts
+    if len(lengths) and lengths.max() > _MAX_DIGITS:
+        raise ValueError(f"Integers over {_MAX_DIGITS} digits overflow int64")
+
+    values = np.zeros(len(starts), dtype=np.int64)
+    for k in range(lengths.max() if len(lengths) else 0):
+        running = np.flatnonzero(lengths > k)
+        values[running] = values[running] * 10 + digits[starts[running] + k]
+
+    signs = starts > 0
+    signs[signs] = a[starts[signs] - 1] == ord('-')
+    values[signs] *= -1
+    return values, starts
+
+
+def split_lines(values, line_numbers):
+    """
+    Splits the integers returned by ints(data, lines=True) into one array per
+    line. Lines without integers are skipped.
+    """
+    breaks = np.flatnonzero(np.diff(line_numbers)) + 1
+    return np.split(values, breaks) if len(values) else []
+
+
+def char_grid(data):
+    """
+    Returns a zero-copy (rows, cols) uint8 view of a grid of equal-width
+    lines. Blank lines before and after the grid are skipped.
+    """
+    a = as_bytes(data)
+    is_text = a != _NEWLINE
+    if not is_text.any():
+        return np.zeros((0, 0), dtype=np.uint8)
+    a = a[np.argmax(is_text):len(a) - np.argmax(is_text[::-1])]
+    is_newline = a == _NEWLINE
+    width = int(np.argmax(is_newline)) if is_newline.any() else len(a)
+    rows = (len(a) + 1) // (width + 1)
+    return np.lib.stride_tricks.as_strided(
+        a, shape=(rows, width), strides=(width + 1, 1), writeable=False)
+
+
+def line_chunks(data, size):
+    """
+    Splits a buffer into memoryview slices (no copies) of at least size
+    bytes that end at line breaks, apart from the last, so that a line-based
+    input can be parsed a chunk at a time.
+    """
+    if isinstance(data, str):
+        data = data.encode()
+    view = memoryview(data)
+    start = 0
+    while start < len(data):
+        end = data.find(b'\n', start + size - 1)
+        end = len(data) if end == -1 else end + 1
+        yield view[start:end]
+        start = end
+
+
+def sections(data):
+    """
+    Splits a buffer into blank-line-separated sections, returned as
+    memoryview slices (no copies).
+    """
+    if isinstance(data, str):
+        data = data.encode()
+    view = memoryview(data)
+    blocks = []
+    start = 0
+    while True:
+        end = data.find(b'\n\n', start)
+        if end == -1:
+            blocks.append(view[start:])
+            break
+        blocks.append(view[start:end])
+        start = end + 2
+        # Treat any run of blank lines as one separator.
+        while start < len(data) and data[start] == _NEWLINE:
+            start += 1
+
+    return blocks
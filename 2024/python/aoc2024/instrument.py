@@ -0,0 +1,107 @@
+"""
+Instrumentation for the solvers: named phase timers, work counters and
+profiling.
+
+Solvers mark their hot spots with `with phase(name):`. Outside of an
+instrumented run, phase() returns a shared do-nothing context manager, so the
+marks cost next to nothing. Inside one, the runner has a Recorder active for
+the step that's running, and every phase adds its time and a call to that
+step's totals.
+
+Solvers also count their units of work (steps simulated, states settled, memo
+hits, ...) with count(name, n). Hot loops keep their counts in local ints and
+report them once, when they're done, so count() is never called per item;
+counts that take extra work to find are only found if counting() is true.
+"""
+
+import cProfile
+import time
+from contextlib import contextmanager, nullcontext
+
+
+_NULL = nullcontext()
+
+# The recorder that phase() and count() report to, set by recording().
+_recorder = None
+
+
+class Recorder:
+    """
+    Totals the seconds spent in, and the calls of, each named phase, and the
+    count of each named counter.
+    """
+
+    def __init__(self):
+        self.phases = {}
+        self.counters = {}
+
+    def add(self, name, seconds):
+        stats = self.phases.setdefault(name, {"seconds": 0.0, "calls": 0})
+        stats["seconds"] += seconds
+        stats["calls"] += 1
+
+    def count(self, name, n):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+
+class _Phase:
+    __slots__ = ("name", "recorder", "start")
+
+    def __init__(self, name, recorder):
+        self.name = name
+        self.recorder = recorder
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        self.recorder.add(self.name, time.perf_counter() - self.start)
+
+
+def phase(name):
+    """Returns a context manager that times its block as the named phase."""
+    if _recorder is None:
+        return _NULL
+    return _Phase(name, _recorder)
+
+
+def count(name, n=1):
+    """Adds n to the named counter, if recording."""
+    if _recorder is not None:
+        _recorder.count(name, n)
+
+
+def counting():
+    """Returns whether counts are being recorded."""
+    return _recorder is not None
+
+
+@contextmanager
+def recording(recorder):
+    """Makes phase() and count() report to the given recorder (or nowhere, if None)."""
+    global _recorder
+    previous, _recorder = _recorder, recorder
+    try:
+        yield recorder
+    finally:
+        _recorder = previous
+
+
+@contextmanager
+def profiling(path):
+    """
+    Profiles the block with cProfile and dumps the stats to path, which can
+    be loaded with pstats. Does nothing if path is None.
+    """
+    if path is None:
+        yield
+        return
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(path)
@@ -0,0 +1,32 @@
+"""
+Deferred imports for heavy dependencies.
+
+NumPy and NetworkX take tens to hundreds of milliseconds to import, which is
+most of the run time of a small day. lazy_import() returns a module object
+straight away and only executes the module on its first attribute access, so
+a day that never reaches the code using a dependency never pays for it.
+"""
+
+import importlib.util
+import sys
+
+
+def lazy_import(name):
+    """
+    Returns the named module, deferring its execution until an attribute of
+    it is first used. A module that is already imported is returned as is.
+    """
+    try:
+        return sys.modules[name]
+    except KeyError:
+        pass
+
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
@@ -0,0 +1,91 @@
+"""
+Explicit memo tables for the recursive solvers.
+
+A Memo is created for a search and passed down it, rather than living in a
+mutable default argument that outlives the search and is shared by every
+call. It can be bounded, in which case the least recently used results are
+evicted once it's full, so that memory stays bounded however many distinct
+states an input leads to. Keeping track of use is a good part of the cost of
+a hit, so a bounded memo only starts doing so once it first fills up, and one
+that never does costs the same as an unbounded one. A memo counts its hits,
+misses and evictions, and report() passes them on to the instrumentation's
+work counters, which shows whether it earns its keep.
+
+Keys should be compact: packing a state into one int with pack() hashes and
+compares much faster than a tuple, and takes less memory.
+"""
+
+from collections import OrderedDict, namedtuple
+
+from aoc2024 import instrument
+
+
+MemoStats = namedtuple("MemoStats", ["hits", "misses", "evictions", "size"])
+
+
+def pack(high, low, bits):
+    """Packs two non-negative ints into one key, with low below 2**bits."""
+    return high << bits | low
+
+
+class Memo:
+    """
+    Results by key, holding at most maxsize of them if given. Results can't
+    be None, since get() returns None for a miss.
+    """
+
+    def __init__(self, maxsize=None):
+        self.maxsize = maxsize
+        self._table = {}
+        # Whether the table is an OrderedDict kept in order of use, which it
+        # becomes when it first fills up.
+        self._lru = False
+        self.hits = self.misses = self.evictions = 0
+        self._reported = MemoStats(0, 0, 0, 0)
+
+    def __len__(self):
+        return len(self._table)
+
+    def get(self, key):
+        """Returns the result stored for key, or None if there isn't one."""
+        value = self._table.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            if self._lru:
+                self._table.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        """Stores the result for key, evicting the oldest if full. Returns it."""
+        self._table[key] = value
+        if self.maxsize is not None and len(self._table) > self.maxsize:
+            if not self._lru:
+                # Until now, the order is just that of the puts.
+                self._table = OrderedDict(self._table)
+                self._lru = True
+            self._table.popitem(last=False)
+            self.evictions += 1
+        return value
+
+    def clear(self):
+        self._table = {}
+        self._lru = False
+
+    def stats(self):
+        return MemoStats(self.hits, self.misses, self.evictions, len(self))
+
+    def report(self, name):
+        """
+        Counts the hits, misses and evictions since the last report as work
+        counters, e.g. "blink memo hits".
+        """
+        stats = self.stats()
+        fields = ["hits", "misses"]
+        if self.maxsize is not None:
+            fields.append("evictions")
+        for field in fields:
+            instrument.count(f"{name} {field}",
+                             getattr(stats, field) - getattr(self._reported, field))
+        self._reported = stats
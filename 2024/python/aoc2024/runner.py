@@ -0,0 +1,315 @@
+"""
+Runs day solvers in-process and times each part.
+
+Timing covers reading and parsing the input (`parse`), then each part on the
+parsed data. Days are imported once, so NumPy and NetworkX are only paid for
+on the first day that needs them.
+
+The parts of a day share one parse, and the intermediates that the solvers
+keep with cache.intermediate(), so Part 2 can build on Part 1's work. With
+the cache on, answers already stored for the same input and solver source
+are returned without parsing the input at all, and the intermediates are
+kept on disk too.
+
+A day that lists ENGINES can be run with one of them instead, e.g. day 1's
+"streaming" engine for inputs too long to fit in memory, which solves both
+parts at once.
+
+Many (day, input) jobs can also be spread over a process pool. Jobs are
+scheduled longest first using the timings recorded by earlier runs, and the
+results come back in the order the jobs were given.
+"""
+
+import importlib
+import json
+import os
+import time
+import tracemalloc
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+
+from aoc2024 import cache, instrument
+from aoc2024.inputs import map_input
+
+
+DAYS = range(1, 19)
+STATE_DIR = Path(__file__).resolve().parent.parent / ".aoc2024"
+TIMINGS_PATH = STATE_DIR / "timings.json"
+PARTS = ("part1", "part2")
+
+Result = namedtuple("Result",
+                    ["day", "source", "answers", "times", "memory", "cached",
+                     "phases", "counters", "engine"],
+                    defaults=[None, False, None, None, None])
+
+
+def load_day(day):
+    """Imports and returns the solver module for the given day."""
+    return importlib.import_module(f"day{day:02d}")
+
+
+def parse_days(spec):
+    """
+    Parses a day selection such as "1-18" or "1,3,5-7" into a sorted list of
+    day numbers. Raises ValueError for a selection that can't be parsed or
+    that selects no days, or days without a solver.
+    """
+    days = set()
+    for chunk in spec.split(','):
+        chunk = chunk.strip()
+        if not chunk:
+            continue
+        try:
+            if '-' in chunk:
+                first, last = map(int, chunk.split('-'))
+                days.update(range(first, last + 1))
+            else:
+                days.add(int(chunk))
+        except ValueError:
+            raise ValueError(f"Bad day selection: {chunk!r}") from None
+    unknown = days.difference(DAYS)
+    if unknown:
+        raise ValueError(f"No solver for day(s): {sorted(unknown)}")
+    if not days:
+        raise ValueError(f"No days selected by {spec!r}")
+
+    return sorted(days)
+
+
+def format_answer(answer):
+    """Converts an answer to a plain Python value for printing or JSON."""
+    if answer is None or isinstance(answer, str):
+        return answer
+    if isinstance(answer, tuple):
+        return ','.join(map(str, answer))
+    return int(answer)
+
+
+def _source_name(source):
+    """Returns a short name for a source, for use in file names."""
+    if source is None:
+        return "default"
+    if isinstance(source, Path):
+        return source.stem
+    return "text"
+
+
+def day_engine(day, name):
+    """
+    Returns the day's engine of the given name, from its ENGINES dict, or
+    raises ValueError if it has none by that name.
+    """
+    engines = getattr(load_day(day), "ENGINES", {})
+    if name not in engines:
+        known = ", ".join(engines) or "none"
+        raise ValueError(f"Day {day:02d} has no engine {name!r} "
+                         f"(engines: {known})")
+    return engines[name]
+
+
+def run_day(day, source=None, trace_memory=False, use_cache=False,
+            record_phases=False, record_counters=False, profile_dir=None,
+            engine=None):
+    """
+    Solves both parts of a day and returns a Result. The times record
+    wall-clock seconds for "parse", "part1" and "part2". If tracing memory,
+    the peak bytes allocated during each of them are recorded too (tracing
+    slows the solvers down, so don't trust the times from the same run).
+
+    If recording phases, the Result also has the totals of the phases that
+    the solvers mark within each step, and if recording counters, the work
+    they count within each step. If given a profile directory, each
+    step is profiled and its stats are dumped there as
+    dayNN-<source>-<step>.prof.
+
+    If using the cache, "parse" also covers hashing the input, and a Result
+    whose answers all came from the cache is marked as cached; its times are
+    just the lookups.
+
+    If given the name of one of the day's ENGINES, that engine solves both
+    parts at once instead, timed as "solve", and the cache isn't used.
+    """
+    module = load_day(day)
+    times = {}
+    memory = {} if trace_memory else None
+    phases = {} if record_phases else None
+    counters = {} if record_counters else None
+
+    @contextmanager
+    def step(name):
+        """Times a step, and records whatever else was asked for."""
+        recording = record_phases or record_counters
+        recorder = instrument.Recorder() if recording else None
+        profile_path = None
+        if profile_dir is not None:
+            profile_path = (Path(profile_dir) /
+                            f"day{day:02d}-{_source_name(source)}-{name}.prof")
+        if trace_memory:
+            tracemalloc.reset_peak()
+        with instrument.recording(recorder), instrument.profiling(profile_path):
+            start = time.perf_counter()
+            yield
+            times[name] = time.perf_counter() - start
+        if trace_memory:
+            memory[name] = tracemalloc.get_traced_memory()[1]
+        if record_phases:
+            phases[name] = recorder.phases
+        if record_counters:
+            counters[name] = recorder.counters
+
+    if trace_memory:
+        tracemalloc.start()
+    try:
+        if engine is not None:
+            solver = day_engine(day, engine)
+            with step("solve"), cache.scope(cache.Scratch()):
+                answers = [format_answer(answer) for answer in solver(source)]
+            return Result(day, _result_source(source), tuple(answers), times,
+                          memory, False, phases, counters, engine)
+
+        with step("parse"):
+            buffer = map_input(source, day)
+            entry = cache.Entry(day, cache.digest(buffer)) if use_cache else None
+            stored = entry.answers() if entry else {}
+            parts = [part for part in PARTS if hasattr(module, part)]
+            cached = all(part in stored for part in parts)
+            # Without the cache, the parts still share their intermediates.
+            store = entry or cache.Scratch()
+            with cache.scope(store):
+                # Don't bother parsing if there's nothing left to solve.
+                data = module.parse(buffer) if not cached else None
+
+        answers = []
+        for part in PARTS:
+            if part not in parts:
+                answers.append(None)
+                continue
+            with step(part), cache.scope(store):
+                if part in stored:
+                    answers.append(stored[part])
+                else:
+                    answers.append(format_answer(getattr(module, part)(data)))
+                    if entry:
+                        entry.store_answer(part, answers[-1])
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+
+    return Result(day, _result_source(source), tuple(answers), times, memory,
+                  cached, phases, counters)
+
+
+def _result_source(source):
+    """Returns how a Result names its source: a path string, or "<text>"."""
+    if isinstance(source, Path):
+        return str(source)
+    return None if source is None else "<text>"
+
+
+def format_result(result):
+    """Returns a one-line summary of a Result for the terminal."""
+    cells = [f"Day {result.day:02d}"]
+    if result.engine is not None:
+        cells.append(f"{result.engine} {result.times['solve'] * 1000:9.1f} ms")
+        cells += [f"{part} {str(answer):>20}"
+                  for part, answer in zip(PARTS, result.answers)]
+        if result.source is not None:
+            cells.append(result.source)
+        return " | ".join(cells)
+
+    cells.append(f"parse {result.times['parse'] * 1000:9.1f} ms")
+    for part, answer in zip(PARTS, result.answers):
+        if part not in result.times:
+            cells.append(f"{part} {'-':>20} {'':>12}")
+            continue
+        cells.append(f"{part} {str(answer):>20} "
+                     f"{result.times[part] * 1000:9.1f} ms")
+    if result.source is not None:
+        cells.append(result.source)
+    if result.cached:
+        cells.append("cached")
+
+    return " | ".join(cells)
+
+
+def format_details(result):
+    """
+    Returns the lines for the peak memory, phase totals and work counters of
+    each step of a Result, whichever were recorded.
+    """
+    lines = []
+    for step in result.times:
+        if result.memory is not None:
+            lines.append(f"    {step:<6} peak memory "
+                         f"{result.memory[step] / 2**20:10.2f} MiB")
+        for name, stats in (result.phases or {}).get(step, {}).items():
+            lines.append(f"    {step:<6} {name:<24} {stats['calls']:>9} calls "
+                         f"{stats['seconds'] * 1000:10.1f} ms")
+        for name, n in (result.counters or {}).get(step, {}).items():
+            lines.append(f"    {step:<6} {name:<24} {n:>15,}")
+
+    return lines
+
+
+def _job_key(day, source):
+    return f"{day}:{source if source is not None else 'default'}"
+
+
+def load_timings(path=TIMINGS_PATH):
+    """Returns the recorded total seconds per job, or {} if none are stored."""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_timings(results, path=TIMINGS_PATH):
+    """
+    Merges the total time of each result into the recorded timings. Cached
+    results are skipped since their times say nothing about the solvers.
+    """
+    timings = load_timings(path)
+    for result in results:
+        if result.cached:
+            continue
+        timings[_job_key(result.day, result.source)] = sum(result.times.values())
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(timings, f, indent=1, sort_keys=True)
+
+
+def schedule(jobs, timings):
+    """
+    Returns the indexes of the (day, source) jobs, longest expected first.
+    Jobs that have never been timed go first since they could be the slowest.
+    """
+    def expected(i):
+        day, source = jobs[i]
+        source = str(source) if source is not None else None
+        return timings.get(_job_key(day, source), float('inf'))
+
+    return sorted(range(len(jobs)), key=expected, reverse=True)
+
+
+def run_jobs(jobs, workers=1, **options):
+    """
+    Runs a list of (day, source) jobs and yields their Results in the same
+    order. With more than one worker, the jobs are run in a process pool.
+    Any options are passed on to run_day().
+    """
+    if workers == 1:
+        for day, source in jobs:
+            yield run_day(day, source, **options)
+        return
+
+    workers = workers or os.cpu_count()
+    order = schedule(jobs, load_timings())
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [None] * len(jobs)
+        for i in order:
+            futures[i] = pool.submit(run_day, *jobs[i], **options)
+        for future in futures:
+            yield future.result()
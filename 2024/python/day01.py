@@ -4,32 +4,176 @@ Day 1: Historian Hysteria
 
 This didn't require NumPy, but it made the list slicing and operations so much
 easier.
+
+Part 2 used to count the right list in a dict, one number at a time. The
+counts now come from np.unique, and the left list is matched against them with
+np.searchsorted.
+
+For lists too long to fit in memory, solve_streaming() parses the input a
+chunk at a time, sorts each chunk's columns and spills them to disk, and
+merges the sorted runs back with aoc2024.external. Both parts then only need
+a single pass over the two sorted lists together: Part 1 pairs them up in
+order, and Part 2 counts each number in both lists as they go by.
 """
 
-import numpy as np
+from aoc2024 import external
+from aoc2024.inputs import ints, line_chunks, map_input
+from aoc2024.lazy import lazy_import
+
+np = lazy_import("numpy")
+
+
+# The input is parsed this many bytes at a time in streaming mode, and each
+# chunk's sorted columns are spilled to disk as runs.
+CHUNK_BYTES = 2**23
+
+
+def parse(data):
+    return ints(data).reshape(-1, 2)
+
+
+def part1(nums):
+    left_list = np.sort(nums[:,0])
+    right_list = np.sort(nums[:,1])
+    return np.abs(left_list - right_list).sum()
+
+
+def part2(nums):
+    right_nums, right_counts = np.unique(nums[:,1], return_counts=True)
+    left_list = nums[:,0]
+    # Where each left number is, or would be, among the right numbers.
+    found = np.searchsorted(right_nums, left_list)
+    matches = found < len(right_nums)
+    matches[matches] = right_nums[found[matches]] == left_list[matches]
+    return (left_list[matches] * right_counts[found[matches]]).sum()
+
+
+def solve(source=None):
+    nums = parse(map_input(source, day=1))
+    return part1(nums), part2(nums)
+
+
+def sorted_distance(left_lists, right_lists):
+    """
+    Returns the total distance between two sorted lists, each given as a
+    stream of arrays that together hold the list in order.
+    """
+    total = 0
+    left = right = np.zeros(0, dtype=np.int64)
+    while True:
+        if not len(left):
+            left = next(left_lists, None)
+        if not len(right):
+            right = next(right_lists, None)
+        if left is None or right is None:
+            return total
+        # Pair up as much of the two as lines up.
+        n = min(len(left), len(right))
+        total += int(np.abs(left[:n] - right[:n]).sum())
+        left, right = left[n:], right[n:]
+
+
+def sorted_similarity(left_lists, right_lists):
+    """
+    Returns the similarity score of two sorted lists, each given as a stream
+    of arrays that together hold the list in order. Each number adds itself
+    times the number of times it's in each list.
+
+    Both lists are taken up to the smallest number that either could still
+    continue with, so every number before that one has been counted in both.
+    That number's counts are carried over, since more of it can follow.
+    """
+    score = 0
+    streams = [left_lists, right_lists]
+    lists = [np.zeros(0, dtype=np.int64) for _ in streams]
+    done = [False for _ in streams]
+    # The number carried over, and its counts in each list so far.
+    carried, carried_counts = None, [0, 0]
+    while True:
+        for k, stream in enumerate(streams):
+            if not len(lists[k]) and not done[k]:
+                more = next(stream, None)
+                if more is None:
+                    done[k] = True
+                else:
+                    lists[k] = more
+        if not any(len(nums) for nums in lists):
+            break
+
+        # A finished list's numbers are all here, so it can't hold any up.
+        going = [nums[-1] for k, nums in enumerate(lists) if not done[k]]
+        if going:
+            cutoff = min(going)
+        else:
+            cutoff = max(nums[-1] for nums in lists if len(nums))
+        ready = []
+        for k, nums in enumerate(lists):
+            n = int(np.searchsorted(nums, cutoff, side='right'))
+            ready.append(nums[:n])
+            lists[k] = nums[n:]
+
+        # Numbers equal to the one carried over come first.
+        if carried is not None:
+            for k, nums in enumerate(ready):
+                n = int(np.searchsorted(nums, carried, side='right'))
+                carried_counts[k] += n
+                ready[k] = nums[n:]
+        if carried == cutoff:
+            continue
+        if carried is not None:
+            score += carried * carried_counts[0] * carried_counts[1]
+        # The cutoff itself is carried over to the next round.
+        carried, carried_counts = int(cutoff), [0, 0]
+        for k, nums in enumerate(ready):
+            n = int(np.searchsorted(nums, cutoff, side='left'))
+            carried_counts[k] = len(nums) - n
+            ready[k] = nums[:n]
+
+        (left_nums, left_counts), (right_nums, right_counts) = (
+            np.unique(nums, return_counts=True) for nums in ready)
+        _, in_left, in_right = np.intersect1d(
+            left_nums, right_nums, assume_unique=True, return_indices=True)
+        score += int((left_nums[in_left] * left_counts[in_left]
+                      * right_counts[in_right]).sum())
+
+    if carried is not None:
+        score += carried * carried_counts[0] * carried_counts[1]
+    return score
+
+
+def solve_streaming(source=None, chunk_bytes=CHUNK_BYTES, block=None,
+                    spill_dir=None):
+    """
+    Solves both parts in memory bounded by the chunk and block sizes, by
+    spilling sorted runs of each list to a temporary directory.
+    """
+    # Imported here, since only streaming needs them and they're slow to load.
+    import tempfile
+    from pathlib import Path
 
+    data = map_input(source, day=1)
+    with tempfile.TemporaryDirectory(dir=spill_dir) as tmp:
+        runs = ([], [])
+        for k, chunk in enumerate(line_chunks(data, chunk_bytes)):
+            nums = parse(chunk)
+            for column, paths in enumerate(runs):
+                paths.append(external.spill(
+                    nums[:,column], Path(tmp) / f"{column}-{k}.npy"))
 
-with open("../_tests/day01.txt") as f:
-    text = f.readlines()
+        runs = [external.combine(paths, block) for paths in runs]
 
-for i, line in enumerate(text):
-    text[i] = line.split()
-nums = np.array(text, dtype='int')
+        def sorted_lists():
+            return [external.merge(paths, block) for paths in runs]
 
-# PART 1.
-left_list = np.sort(nums[:,0])
-right_list = np.sort(nums[:,1])
-total_distance = np.abs(left_list - right_list).sum()
+        return (sorted_distance(*sorted_lists()),
+                sorted_similarity(*sorted_lists()))
 
-print(f'PART 1\tTotal distance is: {total_distance}')
 
-# PART 2.
-right_counts = {}
-for num in right_list:
-    right_counts[num] = right_counts.get(num, 0) + 1
+# For `python -m aoc2024 check`, reference first.
+ENGINES = {"in-memory": solve, "streaming": solve_streaming}
 
-similarity_score = 0
-for num in left_list:
-    similarity_score += num * right_counts.get(num, 0)
 
-print(f'PART 2\tSimilarity score is: {similarity_score}')
+if __name__ == "__main__":
+    total_distance, similarity_score = solve()
+    print(f'PART 1\tTotal distance is: {total_distance}')
+    print(f'PART 2\tSimilarity score is: {similarity_score}')
@@ -3,15 +3,48 @@ Advent of Code 2024
 Day 2: Red-Nosed Reports
 
 Both safety rules can be checked via the differences between consecutive
-levels in each report. `itertools.pairwise` handles this cleanly with NumPy.
+levels in each report, which `np.diff` gives directly.
 
-My solution to Part 2 is technically brute forced, but it works well. If an 
-unsafe report is of length p, then it checks the safety of at most p reports 
-with the i-th level removed.
+My solution to Part 2 was technically brute forced, but it worked well. If an
+unsafe report is of length p, then it checks the safety of at most p reports
+with the i-th level removed. Reports that are already safe in Part 1 stay
+safe, so Part 2 only has to check the unsafe ones. That's quadratic in the
+length of a report, though, so now a single pass over the differences from
+the front and from the back finds every level that can be removed at once.
+
+Checking one report at a time paid NumPy's overhead for every report, so the
+reports are now checked in batches: parse() lays them out as rows of padded
+2D arrays, with a vector of their lengths, and both rules are checked for
+every row at once. For Part 2, the pass that finds the levels that can be
+removed runs over every row at once too. The brute-force version is kept as
+the reference.
 """
 
-import numpy as np
-from itertools import pairwise
+from aoc2024 import cache
+from aoc2024.inputs import ints, map_input, split_lines
+from aoc2024.lazy import lazy_import
+
+np = lazy_import("numpy")
+
+
+# The most levels laid out in one batch, padding included.
+BATCH_CELLS = 2**22
+
+
+def is_strictly_monotonic(x_diffs):
+    # A sequence is strictly monotonic if the differences of consecutive
+    # elements are all of the same sign.
+    return np.all(x_diffs > 0) or np.all(x_diffs < 0)
+
+
+def is_within_range(x_diffs):
+    abs_x_diffs = np.abs(x_diffs)
+    return np.all(1 <= abs_x_diffs) and np.all(abs_x_diffs <= 3)
+
+
+def passes_rules(x):
+    diffs = np.diff(x)
+    return is_strictly_monotonic(diffs) and is_within_range(diffs)
 
 
 def check_safety(report, with_dampening=False):
@@ -19,48 +52,189 @@ def check_safety(report, with_dampening=False):
     Checks if a report passes the two safety rules:
         1. The levels in the report are strictly monotonic;
         2. The differences between consecutive levels are in the range [1,3].
-    
-    If checked with dampening, then a report is tolerably safe if it passes 
-    the two rules after removing exactly one level from an otherwise unsafe 
+
+    If checked with dampening, then a report is tolerably safe if it passes
+    the two rules after removing exactly one level from an otherwise unsafe
     report.
     """
-    def is_strictly_monotonic(x_diffs):
-        # A sequence is strictly monotonic if the differences of consecutive 
-        # elements are all of the same sign.
-        return np.all(x_diffs > 0) or np.all(x_diffs < 0)
-
-    def is_within_range(x_diffs):
-        abs_x_diffs = np.abs(x_diffs)
-        return np.all(1 <= abs_x_diffs) and np.all(abs_x_diffs <= 3)
-
-    def passes_rules(x):
-        diffs = np.array([b - a for a, b in pairwise(x)])
-        return is_strictly_monotonic(diffs) and is_within_range(diffs)
-
     is_safe = passes_rules(report)
     # Runs only for reports in Part 2 and if is_safe = False for that report.
     if with_dampening and not is_safe:
-        n = len(report)
-        for i in range(n):
-            report_minus_i = report[np.arange(n) != i]
-            if passes_rules(report_minus_i):
-                is_safe = True
-                break
-    
+        is_safe = dampened_level(report) is not None
+
     return is_safe
 
 
-with open("../_tests/day02.txt") as f:
-    reports = f.readlines()
+def is_safe_dampened(report):
+    """
+    Checks if a report passes the rules with exactly one level removed, by
+    trying each level in turn.
+    """
+    n = len(report)
+    for i in range(n):
+        report_minus_i = report[np.arange(n) != i]
+        if passes_rules(report_minus_i):
+            return True
+
+    return False
+
+
+def in_range(diffs, low, high):
+    """
+    Returns whether each difference is in [low, high], which is when the
+    difference less low, wrapped around to an unsigned int, is at most
+    high - low; differences below low wrap around to huge values.
+    """
+    unsigned = diffs.dtype.str.replace('i', 'u')
+    return (diffs - low).view(unsigned) <= high - low
+
+
+def batch_safety(levels, lengths):
+    """
+    Checks the two safety rules for every report in a batch at once. The
+    reports are the rows of levels, padded past their lengths, along its
+    last axis, and lengths has the shape of the rest of it.
+    """
+    diffs = np.diff(levels, axis=-1)
+    # Differences past the end of a report are padding, which passes.
+    padding = np.arange(diffs.shape[-1]) >= (lengths - 1)[..., None]
+    rising = in_range(diffs, 1, 3) | padding
+    falling = in_range(diffs, -3, -1) | padding
+    return rising.all(axis=-1) | falling.all(axis=-1)
+
+
+def removable_levels(levels, lengths):
+    """
+    Returns whether removing each level makes its report pass the rules,
+    for reports laid out as in batch_safety(), in time linear in the levels.
+
+    With level i removed, a report passes if the differences before level
+    i - 1 and after level i + 1 all pass, which running ANDs of the
+    differences from the front and from the back give for every i at once,
+    and the difference across the gap, from level i - 1 to level i + 1,
+    passes too.
+    """
+    width = levels.shape[-1]
+    lengths = np.asarray(lengths)[..., None]
+    diffs = np.diff(levels, axis=-1)
+    padding = np.arange(width - 1) >= lengths - 1
+    # Differences across the gap left by each level but the first and last.
+    gaps = levels[..., 2:] - levels[..., :-2]
+    # Levels past the end of a report can't be removed, and the last level
+    # leaves no gap to cross.
+    index = np.arange(width)
+    removable = np.zeros(levels.shape, dtype=bool)
+    ends = np.ones(levels.shape[:-1] + (1,), dtype=bool)
+    for low, high in [(1, 3), (-3, -1)]:
+        passes = in_range(diffs, low, high) | padding
+        before = np.concatenate(
+            [ends, ends, np.logical_and.accumulate(passes, axis=-1)[..., :-1]],
+            axis=-1)[..., :width]
+        after = np.concatenate(
+            [np.logical_and.accumulate(passes[..., ::-1], axis=-1)[..., ::-1],
+             ends, ends], axis=-1)[..., 1:width + 1]
+        across = np.concatenate([ends, in_range(gaps, low, high), ends],
+                                axis=-1)[..., :width] | (index == lengths - 1)
+        removable |= before & after & across
+    return removable & (index < lengths)
+
+
+def dampened_level(report):
+    """
+    Returns the index of the first level whose removal makes the report pass
+    the rules, or None if there isn't one.
+    """
+    report = np.asarray(report)
+    levels = np.flatnonzero(removable_levels(report, len(report)))
+    return int(levels[0]) if len(levels) else None
+
+
+def parse(data):
+    """
+    Returns the reports as a list of (levels, lengths) batches. The reports
+    are sorted by length, and each batch pads them to its longest one.
+    """
+    values, line_numbers = ints(data, lines=True)
+    # Keep the levels in the narrowest ints that hold any difference of two
+    # of them, which makes the batches much quicker to check.
+    if len(values):
+        largest = int(np.abs(values).max())
+        values = values.astype(np.min_scalar_type(-2 * largest - 4))
+    starts = np.flatnonzero(np.diff(line_numbers, prepend=-1))
+    lengths = np.diff(starts, append=len(values))
+    order = np.argsort(lengths, kind='stable')
+    starts, lengths = starts[order], lengths[order]
+
+    batches = []
+    first = 0
+    while first < len(lengths):
+        # Sorted by length, the last report in a batch is its widest.
+        cells = np.arange(1, len(lengths) - first + 1) * lengths[first:]
+        last = first + max(int(np.searchsorted(cells, BATCH_CELLS, 'right')), 1)
+        batch_starts, batch_lengths = starts[first:last], lengths[first:last]
+        levels = np.zeros((len(batch_lengths), batch_lengths[-1]),
+                          dtype=values.dtype)
+        rows = np.repeat(np.arange(len(batch_lengths)), batch_lengths)
+        cols = np.arange(len(rows)) - np.repeat(
+            np.cumsum(batch_lengths) - batch_lengths, batch_lengths)
+        levels[rows, cols] = values[batch_starts[rows] + cols]
+        batches.append((levels, batch_lengths))
+        first = last
+
+    return batches
+
+
+def safety(batches):
+    """
+    Returns whether each report in each batch is safe without dampening.
+    Part 2 builds on it, so it's kept in the cache.
+    """
+    return cache.intermediate("safe", lambda: [
+        batch_safety(levels, lengths) for levels, lengths in batches])
+
+
+def part1(batches):
+    return sum(int(safe.sum()) for safe in safety(batches))
+
+
+def part2(batches):
+    tolerable = 0
+    for (levels, lengths), safe in zip(batches, safety(batches)):
+        tolerable += int(safe.sum())
+        tolerable += int(removable_levels(levels[~safe], lengths[~safe])
+                         .any(axis=-1).sum())
+
+    return tolerable
+
+
+def solve(source=None):
+    batches = parse(map_input(source, day=2))
+    with cache.shared():
+        return part1(batches), part2(batches)
+
+
+# Reference solution, one report at a time, trying every level for Part 2.
+def solve_by_brute_force(source=None):
+    reports = split_lines(*ints(map_input(source, day=2), lines=True))
+    safe = [bool(passes_rules(report)) for report in reports]
+    return (sum(safe),
+            sum(is_safe or is_safe_dampened(report)
+                for report, is_safe in zip(reports, safe)))
+
+
+def solve_by_report(source=None):
+    reports = split_lines(*ints(map_input(source, day=2), lines=True))
+    return (sum(bool(check_safety(report)) for report in reports),
+            sum(bool(check_safety(report, with_dampening=True))
+                for report in reports))
+
+
+# For `python -m aoc2024 check`, reference first.
+ENGINES = {"brute-force": solve_by_brute_force, "by-report": solve_by_report,
+           "batch": solve}
 
-safe_report_count = 0
-tolerable_report_count = 0
-for report in reports:
-    report = np.array(report.split(), dtype='int')
-    # PART 1.
-    safe_report_count += check_safety(report)
-    # PART 2.
-    tolerable_report_count += check_safety(report, with_dampening=True)
 
-print(f'PART 1\tNumber of safe reports: {safe_report_count}')
-print(f'PART 2\tNumber of tolerable reports: {tolerable_report_count}')
+if __name__ == "__main__":
+    safe_report_count, tolerable_report_count = solve()
+    print(f'PART 1\tNumber of safe reports: {safe_report_count}')
+    print(f'PART 2\tNumber of tolerable reports: {tolerable_report_count}')
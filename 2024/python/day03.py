@@ -4,43 +4,213 @@ Day 3: Mull It Over
 
 A straightforward regex problem.
 
-Technically, the evaluations for both parts could have been done in the same 
-loop. At first, I only extracted `mul(x,y)` since that's all that was needed 
-for Part 1. For Part 2, I also found all `do()` and `don't()`s then filtered 
-them out so that I could keep the clean map and sum that I originally used for 
+Technically, the evaluations for both parts could have been done in the same
+loop. At first, I only extracted `mul(x,y)` since that's all that was needed
+for Part 1. For Part 2, I also found all `do()` and `don't()`s then filtered
+them out so that I could keep the clean map and sum that I originally used for
 Part 1.
+
+They now are done in the same loop, without eval(): the regex captures the
+two numbers of each `mul(x,y)`, so the product comes straight from them, and
+the do()/don't() state is kept as the instructions go by. The memory is
+scanned a chunk at a time, so a dump of any size takes constant memory. An
+instruction can be cut in two by the end of a chunk, so the unfinished start
+of one is carried over into the next chunk.
+
+Only whether the muls are enabled depends on what came before, so chunks can
+also be scanned in parallel: each one is summed both as if it started
+enabled and as if it didn't, and the summaries are then combined in order.
 """
 
+import os
 import re
+from collections import namedtuple
+from functools import partial
+
+from aoc2024 import cache
+from aoc2024.inputs import map_input
+
+
+# The memory is scanned this many bytes at a time.
+CHUNK_BYTES = 2**20
+# In parallel, each worker is given ranges of at least this many bytes.
+MIN_RANGE_BYTES = 2**22
+
+# Captures the numbers of a mul(x,y), or the "n't" of a don't(). Starting
+# with the literal alternatives makes the scan noticeably faster.
+INSTRUCTION = re.compile(rb"mul\((\d+),(\d+)\)|do(n't)?\(\)")
+# Any start of an instruction that more memory could still finish.
+UNFINISHED = re.compile(rb"m(?:u(?:l(?:\((?:\d+(?:,\d*)?)?)?)?)?"
+                        rb"|d(?:o(?:\(|n(?:'(?:t\(?)?)?)?)?")
+
+
+def unfinished_start(buffer):
+    """
+    Returns where the unfinished instruction at the end of the buffer starts,
+    or the buffer's length if it doesn't end in one.
+
+    An unfinished instruction has no ')', so it can't overlap a finished one,
+    and it holds a single 'm' or 'd', at its start. So it starts at the last
+    of one or the other, if at all.
+    """
+    starts = [start for start in (buffer.rfind(b'm'), buffer.rfind(b'd'))
+              if start != -1 and UNFINISHED.fullmatch(buffer, start)]
+    return min(starts, default=len(buffer))
+
+
+# The sums of the muls in a range of memory: all of them, the enabled ones
+# before its first do() or don't() if it starts enabled, and the enabled
+# ones after that. Also whether its last do() or don't() enables muls, or
+# None if it has neither.
+Summary = namedtuple("Summary", ["total", "before", "after", "enabled"])
+
+
+def summarize(memory, start=0, stop=None, chunk_bytes=CHUNK_BYTES):
+    """
+    Scans the instructions that start between start and stop, a chunk at a
+    time, and returns their Summary. The last one is read past stop if it
+    doesn't finish before it.
+
+    Instructions can't overlap, since the only 'm' or 'd' in one is the
+    first character, so a range that starts partway into one never finds
+    anything in what's left of it.
+    """
+    view = memoryview(memory)
+    stop = len(view) if stop is None else min(stop, len(view))
+    total = before = after = 0
+    enabled = None
+
+    def run(instructions):
+        nonlocal total, before, after, enabled
+        for x, y, dont in instructions:
+            if not x:
+                enabled = not dont
+                continue
+            product = int(x) * int(y)
+            total += product
+            if enabled is None:
+                before += product
+            elif enabled:
+                after += product
+
+    carried = b''
+    for chunk_start in range(start, stop, chunk_bytes):
+        buffer = carried + view[chunk_start:min(chunk_start + chunk_bytes, stop)]
+        end = unfinished_start(buffer)
+        run(INSTRUCTION.findall(buffer, 0, end))
+        carried = buffer[end:]
+
+    # Finish the unfinished instruction, if any, from past the stop.
+    for chunk_start in range(stop, len(view) if carried else stop, chunk_bytes):
+        carried += view[chunk_start:chunk_start + chunk_bytes]
+        instruction = INSTRUCTION.match(carried)
+        if instruction:
+            run([instruction.groups()])
+            break
+        if not UNFINISHED.fullmatch(carried):
+            break
+
+    return Summary(total, before, after, enabled)
+
+
+def combine(summaries):
+    """
+    Returns the sum of every multiplication and of the enabled ones, given
+    the Summary of each range of memory in order. Memory starts enabled.
+    """
+    total = enabled_total = 0
+    enabled = True
+    for summary in summaries:
+        total += summary.total
+        enabled_total += summary.after + (summary.before if enabled else 0)
+        if summary.enabled is not None:
+            enabled = summary.enabled
+
+    return total, enabled_total
+
+
+def scan(memory, chunk_bytes=CHUNK_BYTES):
+    """
+    Returns the sum of every multiplication, and the sum of the enabled
+    ones, in one pass over the memory.
+    """
+    return combine([summarize(memory, chunk_bytes=chunk_bytes)])
+
+
+def _summarize_range(source, start, stop, chunk_bytes):
+    # Workers map the input themselves rather than being sent it.
+    return summarize(map_input(source, day=3), start, stop, chunk_bytes)
+
+
+def parse(memory):
+    return memory
+
+
+def sums(memory):
+    """Returns both sums, which come from the same scan, kept in the cache."""
+    return cache.intermediate("sums", lambda: scan(memory))
+
+
+def part1(memory):
+    return sums(memory)[0]
+
+
+def part2(memory):
+    return sums(memory)[1]
+
 
+def solve(source=None):
+    memory = parse(map_input(source, day=3))
+    with cache.shared():
+        return part1(memory), part2(memory)
 
-# Define a `mul` function so that any extracted string "mul(x,y)" can be 
-# evaluated as Python code.
-def mul(x, y):
-    return x * y
 
+def solve_parallel(source=None, workers=None, chunk_bytes=CHUNK_BYTES,
+                   range_bytes=MIN_RANGE_BYTES):
+    """
+    Scans ranges of the memory, of at least range_bytes each, in a process
+    pool, by default with a worker per CPU, and combines their summaries.
+    """
+    size = len(map_input(source, day=3))
+    workers = workers or os.cpu_count()
+    # A few ranges per worker, so that a slow one doesn't hold up the rest.
+    range_bytes = max(-(-size // (workers * 4)), range_bytes, 1)
+    starts = range(0, size, range_bytes)
+    stops = [start + range_bytes for start in starts]
+    summarize_range = partial(_summarize_range, source,
+                              chunk_bytes=chunk_bytes)
+    # A pool isn't worth starting for a single range.
+    if workers == 1 or len(starts) <= 1:
+        return combine(map(summarize_range, starts, stops))
+    # Imported here, since loading it would double the day's start time.
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return combine(pool.map(summarize_range, starts, stops))
 
-with open("../_tests/day03.txt") as f:
-    memory = f.read()
 
-# Find all `mul(x,y)`, `do()` and `don't()` substrings.
-instructions = re.findall(r"mul\(\d+,\d+\)|do\(\)|don't\(\)", memory)
+# Reference solution, with every instruction found in the whole memory at
+# once.
+def solve_whole(source=None):
+    memory = bytes(map_input(source, day=3))
+    instructions = INSTRUCTION.findall(memory)
+    total = enabled_total = 0
+    enabled = True
+    for x, y, dont in instructions:
+        if not x:
+            enabled = not dont
+            continue
+        total += int(x) * int(y)
+        if enabled:
+            enabled_total += int(x) * int(y)
+    return total, enabled_total
 
-# PART 1.
-multiplications = [x for x in instructions if x != "do()" and x != "don't()"]
-multiplication_sum = sum(map(eval, multiplications))
 
-print(f'PART 1\tSum of multiplications: {multiplication_sum}')
+# For `python -m aoc2024 check`, reference first.
+ENGINES = {"whole": solve_whole, "streaming": solve,
+           "parallel": solve_parallel}
 
-# PART 2.
-proceed = True
-multiplication_sum = 0
-for instruction in instructions:
-    if instruction == "do()":
-        proceed = True
-    elif instruction == "don't()":
-        proceed = False
-    elif proceed:
-        multiplication_sum += eval(instruction)
 
-print(f'PART 2\tSum of multiplications: {multiplication_sum}')
+if __name__ == "__main__":
+    sum_1, sum_2 = solve()
+    print(f'PART 1\tSum of multiplications: {sum_1}')
+    print(f'PART 2\tSum of multiplications: {sum_2}')
@@ -2,86 +2,147 @@
 Advent of Code 2024
 Day 4: Ceres Search
 
-I can't think of a faster (or at least, more straightforward) solution than 
-to find all the X's and A's and then branch outward. It looks messy, but 
-logically it was easy to implement, and it gets the answers fast. My only 
+I can't think of a faster (or at least, more straightforward) solution than
+to find all the X's and A's and then branch outward. It looks messy, but
+logically it was easy to implement, and it gets the answers fast. My only
 head-banging moment was to get the diagonals right in Part 2.
 
-NumPy wasn't really necessary, but it makes indexing easier for me to write 
-and follow.
+The grid is the shared byte grid from `aoc2024.grid`, padded with a border
+wide enough that reading a word off the edge of the map needs no bounds
+checks.
+
+Branching out from each X and A in Python was the slow part on big grids,
+so now tiles are checked a block at a time: a word (or a cross) is a pattern
+of letters at flat offsets from a starting tile, and comparing shifted slices
+of each letter's mask over the block finds every tile in it that a pattern
+starts at.
+The tile-by-tile version is kept as the reference.
+
+Part 1 is also a plain word search, so it can go through the shared
+multi-word search in `aoc2024.wordsearch`, which runs an Aho-Corasick
+automaton along every line of the grid and would find a whole list of words
+in the same single pass.
 """
 
-import numpy as np
-
-
-def get_words(x, y, x_max, y_max, d=4):
-    words = []
-    # Top right.
-    if (y - d + 1 >= 0) and (x + d - 1 < x_max):
-        words.append([grid[x+k,y-k] for k in range(d)])
-    # Bottom right.
-    if (y + d - 1 < y_max) and (x + d - 1 < x_max):
-        words.append([grid[x+k,y+k] for k in range(d)])
-    # Bottom left.
-    if (y + d - 1 < y_max) and (x - d + 1 >= 0):
-        words.append([grid[x-k,y+k] for k in range(d)])
-    # Top left.
-    if (y - d + 1 >= 0) and (x - d + 1 >= 0):
-        words.append([grid[x-k,y-k] for k in range(d)])
-    # Up.
-    if y - d + 1 >= 0:
-        words.append([grid[x,y-k] for k in range(d)])
-    # Right.
-    if x + d - 1 < x_max:
-        words.append([grid[x+k,y] for k in range(d)])
-    # Down.
-    if y + d - 1 < y_max:
-        words.append([grid[x,y+k] for k in range(d)])
-    # Left.
-    if x - d + 1 >= 0:
-        words.append([grid[x-k,y] for k in range(d)])
-    
-    # Return the words in each of the eight directions as a list of strings.
-    for i, word in enumerate(words):
-        words[i] = ''.join(word)
-    
-    return words
+from aoc2024.grid import Grid
+from aoc2024.inputs import map_input
+from aoc2024.lazy import lazy_import
+from aoc2024.wordsearch import count_words
+
+np = lazy_import("numpy")
+
+
+# Tiles checked at a time, few enough that their masks stay in cache.
+BLOCK = 2**16
+
+
+def get_words(tiles, i, offsets, d=4):
+    """
+    Returns the words of length d read outward from flat index i in each of
+    the directions given by the flat offsets. The grid is padded so that
+    every word stays in bounds; words running off the map just pick up the
+    sentinel border.
+    """
+    return [bytes([tiles[i + k * offset] for k in range(d)]) for offset in offsets]
 
 
 def is_xmas(word):
-    return word == "XMAS" or word == "SAMX"
+    return word == b"XMAS" or word == b"SAMX"
+
+
+def is_cross_mas(tiles, i, stride):
+    # Points on the map's edge see the border in their diagonals, so only
+    # interior points can be the center of a cross.
+    diag_1 = bytes([tiles[i + k * (stride + 1)] for k in [-1, 0, 1]])
+    diag_2 = bytes([tiles[i + k * (stride - 1)] for k in [1, 0, -1]])
+    return (diag_1 == b"MAS" or diag_1 == b"SAM") and \
+        (diag_2 == b"MAS" or diag_2 == b"SAM")
+
+
+def parse(text):
+    return Grid.from_text(text, pad=3)
+
+
+def count_patterns(grid, patterns):
+    """
+    Counts the tiles i and patterns such that tile i + offset is the letter
+    for every (offset, letter) in the pattern. The patterns must stay within
+    the grid's padding.
+
+    The starting tiles are taken a block at a time, comparing shifted slices
+    of each letter's mask over the block, so that the masks stay in cache.
+    """
+    flat = grid.flat
+    offsets = [offset for pattern in patterns for offset, _ in pattern]
+    low, high = min(offsets), max(offsets)
+    letters = {letter for pattern in patterns for _, letter in pattern}
+    count = 0
+    for start in range(-low, len(flat) - high, BLOCK):
+        stop = min(start + BLOCK, len(flat) - high)
+        window = flat[start + low:stop + high]
+        masks = {letter: window == ord(letter) for letter in letters}
+        for pattern in patterns:
+            (offset, letter), *rest = pattern
+            found = masks[letter][offset - low:offset - low + stop - start].copy()
+            for offset, letter in rest:
+                found &= masks[letter][offset - low:offset - low + stop - start]
+            count += int(np.count_nonzero(found))
+
+    return count
+
+
+def part1(grid):
+    # XMAS read backwards along one direction is SAMX read forwards along
+    # the opposite one, so four directions cover all eight.
+    north, northeast, east, southeast = grid.offsets8[:4]
+    return count_patterns(grid, [
+        list(zip([0, offset, 2 * offset, 3 * offset], word))
+        for offset in [east, southeast, -north, -northeast]
+        for word in ["XMAS", "SAMX"]])
+
+
+def part2(grid):
+    # Each diagonal through the A reads MAS either way.
+    down_right = grid.stride + 1
+    down_left = grid.stride - 1
+    return count_patterns(grid, [
+        [(0, "A"), (-down_right, one[0]), (down_right, one[1]),
+         (-down_left, other[0]), (down_left, other[1])]
+        for one in ["MS", "SM"] for other in ["MS", "SM"]])
+
+
+def solve(source=None):
+    grid = parse(map_input(source, day=4))
+    return part1(grid), part2(grid)
+
 
+# Reference solution, branching out from each X and A.
+def solve_by_tile(source=None):
+    grid = parse(map_input(source, day=4))
+    tiles = grid.tobytes()
+    xmas_count = 0
+    for i in grid.find('X').tolist():
+        words = get_words(tiles, i, grid.offsets8)
+        xmas_count += sum([is_xmas(word) for word in words])
 
-def is_cross_mas(x, y, x_max, y_max):
-    # Only interior points can be the center of a cross.
-    if (0 < x < x_max - 1) and (0 < y < y_max - 1):
-        diag_1 = ''.join([grid[x+k,y+k] for k in [-1, 0, 1]])
-        diag_2 = ''.join([grid[x+k,y-k] for k in [1, 0, -1]])
-        return (diag_1 == "MAS" or diag_1 == "SAM") and \
-            (diag_2 == "MAS" or diag_2 == "SAM")
-    
-    return False
+    cross_count = 0
+    for i in grid.find('A').tolist():
+        cross_count += is_cross_mas(tiles, i, grid.stride)
 
+    return xmas_count, cross_count
 
-with open("../_tests/day04.txt") as f:
-    lines = f.read().splitlines()
 
-grid = np.array([list(line) for line in lines])
-dims = grid.shape
+def solve_by_automaton(source=None):
+    grid = parse(map_input(source, day=4))
+    return count_words(grid.view, ["XMAS"])["XMAS"], part2(grid)
 
-# PART 1.
-X_indexes = zip(*np.where(grid == 'X'))
-xmas_count = 0
-for i, j in X_indexes:
-    words = get_words(i, j, *dims)
-    xmas_count += sum([is_xmas(word) for word in words])
 
-print(f'PART 1\tXMAS appears: {xmas_count} times')
+# For `python -m aoc2024 check`, reference first.
+ENGINES = {"by-tile": solve_by_tile, "shifted": solve,
+           "aho-corasick": solve_by_automaton}
 
-# PART 2.
-A_indexes = zip(*np.where(grid == 'A'))
-cross_count = 0
-for i, j in A_indexes:
-    cross_count += is_cross_mas(i, j, *dims)
 
-print(f'PART 2\tNumber of X-MAS crosses: {cross_count}')
+if __name__ == "__main__":
+    xmas_count, cross_count = solve()
+    print(f'PART 1\tXMAS appears: {xmas_count} times')
+    print(f'PART 2\tNumber of X-MAS crosses: {cross_count}')
@@ -2,30 +2,53 @@
 Advent of Code 2024
 Day 5: Print Queue
 
-This one is easy with custom sorting. The tricky part, for me, was getting the 
-callable in `cmp_to_key` to behave correctly. Mine is probably not the most 
-efficient implementation, since each comparison performs a linear scan of a 
+This one is easy with custom sorting. The tricky part, for me, was getting the
+callable in `cmp_to_key` to behave correctly. Mine is probably not the most
+efficient implementation, since each comparison performs a linear scan of a
 list of valid pages, but I'm happy with it nonetheless. (This program runs
 fast on the given input anyway).
 
-Another approach would be to treat the pages as nodes in a directed graph, 
-with the page ordering rules the directed edges to other pages. Then assessing 
-whether an update is valid amounts to checking whether there is a directed 
+Another approach would be to treat the pages as nodes in a directed graph,
+with the page ordering rules the directed edges to other pages. Then assessing
+whether an update is valid amounts to checking whether there is a directed
 edge from page to page in the update's listed order.
 
-I got the right answer to Part 1 by this approach, but Part 2 stumped me; I 
-pursued the sorting solution instead. I found out later that there does exist 
+I got the right answer to Part 1 by this approach, but Part 2 stumped me; I
+pursued the sorting solution instead. I found out later that there does exist
 a sort for this situation: Topological sorting, which NetworkX implements.
+
+Neither needs a sort, though. With the rules as a matrix of whether each
+page must come before each other one, an update is valid if the rule holds
+for each of its consecutive pairs, which is one lookup for all of them. And
+the middle page of a corrected update is the one that exactly half of the
+others must come before, so counting those for every page picks it out
+without putting the rest in order. Pages are numbered from 0 in the matrix,
+and parse() groups the updates by length into 2D arrays of those numbers,
+so every update of a length is checked at once. Both of the earlier
+solutions are kept as references, though the comparator now looks pages up
+in sets rather than scanning lists.
 """
 
-import networkx as nx
-from functools import cmp_to_key
+from functools import cmp_to_key, partial
 from itertools import pairwise
 
+from aoc2024 import cache
+from aoc2024.inputs import ints, map_input, sections, split_lines
+from aoc2024.lazy import lazy_import
+
+np = lazy_import("numpy")
+nx = lazy_import("networkx")
+
+
+# The most rule lookups made at once when correcting updates.
+BATCH_CELLS = 2**22
+# Page numbers below this are numbered from a table rather than by sorting.
+TABLE_PAGES = 2**20
+
 
-def order_pages(page_before, page_after):
+def order_pages(page_before, page_after, rules):
     """Custom comparator for whether one page can appear before another."""
-    valid_pages_after = rules.get(page_before, [])
+    valid_pages_after = rules.get(page_before, ())
     if page_after not in valid_pages_after:
         return 1
     elif page_before == page_after:
@@ -39,62 +62,168 @@ def is_valid(update, G):
     return all([G.has_edge(u, v) for u, v in pairwise(update)])
 
 
-with open("../_tests/day05.txt") as f:
-    text = f.read().splitlines()
+def parse_lists(data):
+    # The rules and updates blocks are separated by a blank line.
+    rules_block, updates_block = sections(data)[:2]
     rules = {}
-    updates = []
-    reading_rules = True
-    for line in text:
-        # The rules and updates blocks are separated by a blank line. This is 
-        # a hacky way to parse them separately but in one pass.
-        if not line:
-            reading_rules = False
-            continue
-        # Map each page number to a list of valid page numbers that can 
-        # follow it.
-        if reading_rules:
-            page_before, page_after = tuple(map(int, line.split('|')))
-            rules[page_before] = rules.get(page_before, []) + [page_after]
-        else:
-            updates.append(list(map(int, line.split(','))))
+    for page_before, page_after in ints(rules_block).reshape(-1, 2).tolist():
+        # Map each page number to the set of page numbers that can follow it.
+        rules.setdefault(page_before, set()).add(page_after)
+    updates = [update.tolist()
+               for update in split_lines(*ints(updates_block, lines=True))]
+
+    return rules, updates
+
+
+def number_pages(numbers):
+    """
+    Returns the distinct page numbers, sorted, and the index of each of the
+    numbers among them. Page numbers are small, so that's usually quickest
+    by marking off the ones present in a table.
+    """
+    if not len(numbers) or numbers.min() < 0 or numbers.max() >= TABLE_PAGES:
+        return np.unique(numbers, return_inverse=True)
+    present = np.zeros(int(numbers.max()) + 1, dtype=bool)
+    present[numbers] = True
+    indexes = np.cumsum(present) - 1
+    return np.flatnonzero(present), indexes[numbers]
+
+
+def parse(data):
+    """
+    Returns (pages, before, updates). pages holds every page number in the
+    input, sorted, and pages are referred to by their indexes in it;
+    before[a, b] is whether page a must come before page b. updates is a
+    list of 2D arrays of pages, one for each length of update, with an
+    update in each row.
+    """
+    rules_block, updates_block = sections(data)[:2]
+    pairs = ints(rules_block).reshape(-1, 2)
+    values, line_numbers = ints(updates_block, lines=True)
+    pages, ids = number_pages(np.concatenate([pairs.reshape(-1), values]))
+    rule_ids, values = ids[:pairs.size].reshape(-1, 2), ids[pairs.size:]
+    before = np.zeros((len(pages), len(pages)), dtype=bool)
+    before[rule_ids[:, 0], rule_ids[:, 1]] = True
+
+    starts = np.flatnonzero(np.diff(line_numbers, prepend=-1))
+    lengths = np.diff(starts, append=len(values))
+    updates = [values[starts[lengths == length, None] + np.arange(length)]
+               for length in np.unique(lengths).tolist()]
+
+    return pages, before, updates
+
+
+def validity(before, updates):
+    """
+    Returns whether each update of each length is in the right order, which
+    is when every consecutive pair of its pages is. Both parts need it, so
+    it's kept in the cache.
+    """
+    return cache.intermediate("valid updates", lambda: [
+        before[batch[:, :-1], batch[:, 1:]].all(axis=1) for batch in updates])
+
+
+def corrected_middles(before, batch):
+    """
+    Returns the middle page of each update in the batch once put in the
+    right order, assuming that the rules order every pair of its pages. In
+    that order, the middle page of an update of n pages has n // 2 others
+    before it, which is how many of them must come before it.
+    """
+    n = batch.shape[1]
+    middles = np.empty(len(batch), dtype=batch.dtype)
+    rows = max(BATCH_CELLS // (n * n), 1)
+    for start in range(0, len(batch), rows):
+        chunk = batch[start:start + rows]
+        # ahead[k, i, j] is whether page i must come before page j.
+        ahead = before[chunk[:, :, None], chunk[:, None, :]]
+        middle = np.argmax(ahead.sum(axis=1) == n // 2, axis=1)
+        middles[start:start + rows] = chunk[np.arange(len(chunk)), middle]
+    return middles
+
+
+def part1(data):
+    pages, before, updates = data
+    middle_page_number_sum = 0
+    for batch, valid in zip(updates, validity(before, updates)):
+        n = batch.shape[1]
+        middle_page_number_sum += int(pages[batch[valid, n // 2]].sum())
+
+    return middle_page_number_sum
+
+
+def part2(data):
+    pages, before, updates = data
+    corrected_middle_page_number_sum = 0
+    for batch, valid in zip(updates, validity(before, updates)):
+        middles = corrected_middles(before, batch[~valid])
+        corrected_middle_page_number_sum += int(pages[middles].sum())
+
+    return corrected_middle_page_number_sum
+
+
+def solve(source=None):
+    data = parse(map_input(source, day=5))
+    with cache.shared():
+        return part1(data), part2(data)
+
 
 # Original solution by sorting with a custom comparator.
-middle_page_number_sum = 0
-corrected_middle_page_number_sum = 0
-for update in updates:
-    n = len(update)
-    sorted_update = sorted(update, key=cmp_to_key(order_pages))
-    # PART 1.
-    if update == sorted_update:
-        middle_page_number = update[n // 2]
-        middle_page_number_sum += middle_page_number
-    # PART 2.
-    else:
-        corrected_middle_page_number = sorted_update[n // 2]
-        corrected_middle_page_number_sum += corrected_middle_page_number
+def solve_by_sorting(source=None):
+    rules, updates = parse_lists(map_input(source, day=5))
+    key = cmp_to_key(partial(order_pages, rules=rules))
+    middle_page_number_sum = 0
+    corrected_middle_page_number_sum = 0
+    for update in updates:
+        n = len(update)
+        sorted_update = sorted(update, key=key)
+        if update == sorted_update:
+            middle_page_number_sum += update[n // 2]
+        else:
+            corrected_middle_page_number_sum += sorted_update[n // 2]
+
+    return middle_page_number_sum, corrected_middle_page_number_sum
 
-print("Solved by sorting with a custom comparator:")
-print(f'PART 1\tPage number sum: {middle_page_number_sum}')
-print(f'PART 2\tCorrected page number sum: {corrected_middle_page_number_sum}')
 
 # Alternate solution treating the rules as a directed acyclic graph.
-alt_ans_1 = 0
-alt_ans_2 = 0
-G = nx.DiGraph(rules)
-for update in updates:
-    n = len(update)
-    if is_valid(update, G):
-        middle_page_number = update[n // 2]
-        alt_ans_1 += middle_page_number
-    else:
-        H = G.subgraph(update)
-        sorted_update = list(nx.topological_sort(H))
-        corrected_middle_page_number = sorted_update[n // 2]
-        alt_ans_2 += corrected_middle_page_number
+def solve_dag(source=None):
+    rules, updates = parse_lists(map_input(source, day=5))
+    alt_ans_1 = 0
+    alt_ans_2 = 0
+    G = nx.DiGraph(rules)
+    for update in updates:
+        n = len(update)
+        if is_valid(update, G):
+            middle_page_number = update[n // 2]
+            alt_ans_1 += middle_page_number
+        else:
+            H = G.subgraph(update)
+            sorted_update = list(nx.topological_sort(H))
+            corrected_middle_page_number = sorted_update[n // 2]
+            alt_ans_2 += corrected_middle_page_number
+
+    return alt_ans_1, alt_ans_2
+
+
+# For `python -m aoc2024 check`, reference first.
+ENGINES = {
+    "comparator": solve_by_sorting,
+    "dag": solve_dag,
+    "rule-matrix": solve,
+}
+
+
+if __name__ == "__main__":
+    middle_page_number_sum, corrected_middle_page_number_sum = solve()
+
+    print("Solved with a matrix of the rules:")
+    print(f'PART 1\tPage number sum: {middle_page_number_sum}')
+    print(f'PART 2\tCorrected page number sum: {corrected_middle_page_number_sum}')
 
-assert alt_ans_1 == middle_page_number_sum
-assert alt_ans_2 == corrected_middle_page_number_sum
+    alt_ans_1, alt_ans_2 = solve_dag()
+    assert alt_ans_1 == middle_page_number_sum
+    assert alt_ans_2 == corrected_middle_page_number_sum
 
-print("\nSolved with a DAG:")
-print(f'PART 1\tPage number sum: {alt_ans_1}')
-print(f'PART 2\tCorrected page number sum: {alt_ans_2}')
+    print("\nSolved with a DAG:")
+    print(f'PART 1\tPage number sum: {alt_ans_1}')
+    print(f'PART 2\tCorrected page number sum: {alt_ans_2}')
@@ -3,13 +3,24 @@ Advent of Code 2024
 Day 8: Resonant Collinearity
 
 A surprisingly straightforward grid problem.
+
+The antinodes used to be collected in a set of coordinate tuples, one pair
+of antennas at a time. Now every pair of antennas with the same frequency is
+handled at once with NumPy, and the antinodes are marked by packed key in an
+aoc2024.coords.KeySet. The tuple-set version is kept as the reference.
 """
 
-import numpy as np
 from itertools import combinations
 
+from aoc2024.coords import KeySet, in_bounds, pack
+from aoc2024.grid import Grid
+from aoc2024.inputs import map_input
+from aoc2024.lazy import lazy_import
+
+np = lazy_import("numpy")
 
-def get_antinodes(antennas, dims, resonant=False):
+
+def get_antinode_set(antennas, dims, resonant=False):
     """Returns a list of antinode coordinates for the input list of antennas."""
     x_max, y_max = dims
     antinodes = set()
@@ -40,29 +51,122 @@ def place_antinodes(coords, antinode_map):
         antinode_map[coord] = True
 
 
-with open("../_tests/day08.txt") as f:
-    antenna_map = f.read().splitlines()
-    antenna_map = np.array([list(line) for line in antenna_map])
+def runs(lengths):
+    """
+    Lays runs of the given lengths end to end, and returns the run of each
+    item and the item's position within its run.
+    """
+    run = np.repeat(np.arange(len(lengths)), lengths)
+    run_starts = np.cumsum(lengths) - lengths
+    return run, np.arange(len(run)) - run_starts[run]
+
+
+def get_antinodes(pairs, dims, resonant=False):
+    """
+    Returns the packed keys of the antinodes of pairs of antennas, given as
+    arrays of the coordinates of the first and second antenna of each pair.
+    """
+    node1, node2 = pairs
+    delta = node2 - node1
+    # Antinodes lie on the line through the pair, stepping out from each
+    # antenna by the spacing between them.
+    starts = np.concatenate([node1, node2])
+    steps = np.concatenate([-delta, delta])
+    if resonant:
+        # Every multiple of the spacing, including the antennas themselves,
+        # up to the edge of the map: count how many steps fit along each
+        # axis, which is any number along one the steps don't move along.
+        room = (np.where(steps > 0, np.array(dims) - 1 - starts, starts)
+                // np.maximum(np.abs(steps), 1))
+        room[steps == 0] = max(dims)
+        which, multiples = runs(room.min(axis=1) + 1)
+        nodes = starts[which] + multiples[:, None] * steps[which]
+    else:
+        nodes = starts + steps
+    xs, ys = nodes[:, 0], nodes[:, 1]
+    on_map = in_bounds(xs, ys, dims)
+
+    return pack(xs[on_map], ys[on_map], dims[1])
+
+
+def pair_up(coords, frequencies):
+    """
+    Returns the coordinates of every pair of antennas with the same
+    frequency, as arrays of the first and second antenna of each pair.
+    """
+    order = np.argsort(frequencies, kind='stable')
+    coords, frequencies = coords[order], frequencies[order]
+    # Each antenna pairs with the ones after it with the same frequency, up
+    # to the end of the frequency's run.
+    n = len(frequencies)
+    partners = np.searchsorted(frequencies, frequencies, side='right') - np.arange(n) - 1
+    first, after = runs(partners)
+    second = first + 1 + after
+
+    return coords[first], coords[second]
+
+
+def parse(text):
+    antenna_map = Grid.from_text(text)
     dims = antenna_map.shape
 
-# Hash arrays of the coordinates of antennas according to frequency.
-coords_dict = {}
-for x, y in np.ndindex(dims):
-    if antenna_map[x,y] != '.':
-        coords_dict[antenna_map[x,y]] = coords_dict.get(antenna_map[x,y], [])
-        coords_dict[antenna_map[x,y]].append((x, y))
-
-antinode_count = 0
-antinode_map = np.zeros(dims, dtype='bool')
-resonant_antinode_count = 0
-resonant_antinode_map = np.zeros(dims, dtype='bool')
-for coords_list in coords_dict.values():
-    # PART 1.
-    antinodes = get_antinodes(coords_list, dims, resonant=False)
-    place_antinodes(antinodes, antinode_map)
-    # PART 2.
-    resonant_antinodes = get_antinodes(coords_list, dims, resonant=True)
-    place_antinodes(resonant_antinodes, resonant_antinode_map)
-
-print(f'Number of unique antinodes: {antinode_map.sum()}')
-print(f'Number of resonant antinodes: {resonant_antinode_map.sum()}')
+    antennas = np.flatnonzero(antenna_map.flat != ord('.'))
+    frequencies = antenna_map.flat[antennas]
+    coords = np.stack(antenna_map.positions(antennas), axis=1)
+
+    return pair_up(coords, frequencies), dims
+
+
+def count_antinodes(data, resonant=False):
+    pairs, dims = data
+    antinodes = KeySet(dims[0] * dims[1])
+    antinodes.add_many(get_antinodes(pairs, dims, resonant=resonant))
+
+    return len(antinodes)
+
+
+def part1(data):
+    return count_antinodes(data, resonant=False)
+
+
+def part2(data):
+    return count_antinodes(data, resonant=True)
+
+
+def solve(source=None):
+    data = parse(map_input(source, day=8))
+    return part1(data), part2(data)
+
+
+# Reference solution, one pair of antennas at a time.
+def solve_by_pair(source=None):
+    antenna_map = Grid.from_text(map_input(source, day=8))
+    dims = antenna_map.shape
+
+    # Hash arrays of the coordinates of antennas according to frequency.
+    coords_dict = {}
+    antennas = np.flatnonzero(antenna_map.flat != ord('.'))
+    frequencies = antenna_map.flat[antennas].tolist()
+    xs, ys = antenna_map.positions(antennas)
+    for frequency, x, y in zip(frequencies, xs.tolist(), ys.tolist()):
+        coords_dict.setdefault(frequency, []).append((x, y))
+
+    counts = []
+    for resonant in [False, True]:
+        antinode_map = np.zeros(dims, dtype='bool')
+        for coords_list in coords_dict.values():
+            antinodes = get_antinode_set(coords_list, dims, resonant=resonant)
+            place_antinodes(antinodes, antinode_map)
+        counts.append(int(antinode_map.sum()))
+
+    return tuple(counts)
+
+
+# For `python -m aoc2024 check`, reference first.
+ENGINES = {"by-pair": solve_by_pair, "vectorized": solve}
+
+
+if __name__ == "__main__":
+    antinode_count, resonant_antinode_count = solve()
+    print(f'Number of unique antinodes: {antinode_count}')
+    print(f'Number of resonant antinodes: {resonant_antinode_count}')
@@ -2,88 +2,94 @@
 Advent of Code 2024
 Day 10: Hoof It
 
-Part 1 is (what should have been) a simple DFS. I spent a lot of time 
-not realizing that I forgot to pass an empty list to `paths=[]` for the DFS 
+Part 1 is (what should have been) a simple DFS. I spent a lot of time
+not realizing that I forgot to pass an empty list to `paths=[]` for the DFS
 initiated at each trailhead. But getting the DFS right meant that Part 2
 followed immediately from the work done for Part 1.
+
+Listing every path made the search as slow as the number of trails. The
+climb now only returns the peaks and the number of trails from each tile,
+memoized in an aoc2024.memo.Memo, so each tile is climbed from just once.
 """
 
-import numpy as np
+from aoc2024 import cache
+from aoc2024.grid import Grid
+from aoc2024.inputs import map_input
+from aoc2024.memo import Memo
 
 
-def find_paths(grid, current_path=[(0, 0)], paths=[]):
-    """
-    DFS to find all peaks reachable from a given trailhead. Input requires a 
-    list with one element, the starting coordinates of the trailhead.
+# Heights are compared as their ASCII digits, which are consecutive.
+PEAK = ord('9')
 
-    Returns a list of lists of coordinates, where each list is a path from the 
-    trailhead to a peak.
-    """
-    assert current_path, "Search requires a list with starting point [(x, y)]."
-    if len(current_path) == 1:
-        start = current_path[0]
-        assert grid[start] == 0, "Search must start at a trailhead."
-    
-    # Can go up, right, left, or down from current position (x, y).
-    directions = [(0, 1), (1, 0), (0, -1), (-1, 0)]
-    x, y = current_path[-1]
-    x_max, y_max = grid.shape
-    for (dx, dy) in directions:
-        new_x = x + dx
-        new_y = y + dy
-        # Check if in bounds.
-        if (new_x < 0 or new_x >= x_max) or (new_y < 0 or new_y >= y_max):
-            continue
-        # Check if next point follows the trail.
-        if grid[new_x,new_y] != grid[x,y] + 1:
-            continue
-        # Check if next point has already been visited.
-        if (new_x, new_y) in current_path:
-            continue
-        # Otherwise, move to next point.
-        current_path_copy = current_path.copy()
-        current_path_copy.append((new_x, new_y))
-        # Paths conclude at a peak.
-        if grid[new_x,new_y] == 9:
-            paths.append(current_path_copy)
-        # Recurse.
-        find_paths(grid, current_path=current_path_copy, paths=paths)
-    
-    return paths
-
-
-def trailhead_score(paths):
+
+def climb(tiles, offsets, i, memo):
     """
-    Calculates trailhead score as the number of unique peaks reached from a 
-    trailhead. Throws an error if the paths do not have the same trailhead.
+    DFS up from a tile, given as its flat index in the padded map. Returns
+    the set of peaks reachable from it and the number of trails that reach
+    them. Memoized by tile, since trails from different trailheads, and
+    different trails from the same one, meet on the way up.
     """
-    assert len({path[0] for path in paths}) == 1, "Check trailhead"
-    return len({path[-1] for path in paths})
+    if tiles[i] == PEAK:
+        return frozenset([i]), 1
+
+    found = memo.get(i)
+    if found is not None:
+        return found
+
+    peaks, trails = frozenset(), 0
+    # Can go up, right, down, or left from the current tile. Heights only
+    # ever climb along a trail, so it can't come back to a tile it's visited.
+    for offset in offsets:
+        new_i = i + offset
+        # Check if next point follows the trail. The map is padded with a
+        # sentinel border, which never does, so there's no bounds check.
+        if tiles[new_i] != tiles[i] + 1:
+            continue
+        new_peaks, new_trails = climb(tiles, offsets, new_i, memo)
+        peaks |= new_peaks
+        trails += new_trails
+
+    return memo.put(i, (peaks, trails))
 
 
-def trailhead_rating(paths):
+def parse(text):
+    return Grid.from_text(text, pad=1)
+
+
+def trailhead_stats(topo_map):
     """
-    Returns the number of paths that originate from the same trailhead. Throws 
-    an error if the paths do not have the same trailhead.
+    Returns the (score, rating) of every trailhead: the number of peaks it
+    reaches, and the number of trails to them. Both come from the same climb,
+    so they're found once and kept in the cache.
     """
-    assert len({path[0] for path in paths}) == 1, "Check trailhead"
-    return len(paths)
-
-
-with open("../_tests/day10.txt") as f:
-    topo_map = f.read().splitlines()
-    topo_map = np.array([list(line) for line in topo_map], dtype='int')
-
-trailheads = [tuple(coord) for coord in np.argwhere(topo_map == 0).tolist()]
-score_sum = 0
-rating_sum = 0
-for trailhead in trailheads:
-    current_path = [trailhead]
-    paths = find_paths(topo_map, current_path, paths=[])
-    # PART 1.
-    score_sum += trailhead_score(paths)
-    # PART 2.
-    rating_sum += trailhead_rating(paths)
-    
-print(f'PART 1\tSum of trailhead scores: {score_sum}')
-print(f'PART 2\tSum of trailhead ratings: {rating_sum}')
+    def climb_all():
+        tiles = topo_map.tobytes()
+        memo = Memo()
+        stats = []
+        for trailhead in topo_map.find('0').tolist():
+            peaks, trails = climb(tiles, topo_map.offsets, trailhead, memo)
+            stats.append((len(peaks), trails))
+        memo.report("trail memo")
+        return stats
+
+    return cache.intermediate("trailheads", climb_all)
+
+
+def part1(topo_map):
+    return sum(score for score, _ in trailhead_stats(topo_map))
+
+
+def part2(topo_map):
+    return sum(rating for _, rating in trailhead_stats(topo_map))
+
+
+def solve(source=None):
+    topo_map = parse(map_input(source, day=10))
+    with cache.shared():
+        return part1(topo_map), part2(topo_map)
+
+
+if __name__ == "__main__":
+    score_sum, rating_sum = solve()
+    print(f'PART 1\tSum of trailhead scores: {score_sum}')
+    print(f'PART 2\tSum of trailhead ratings: {rating_sum}')
@@ -2,50 +2,97 @@
 Advent of Code 2024
 Day 11: Plutonian Pebbles
 
-An easy DP problem when memoized. Instead of using any functools helpers, I 
+An easy DP problem when memoized. Instead of using any functools helpers, I
 opted to memoize it myself as an exercise.
+
+The memo used to be a mutable default argument, keyed by stone and blink
+number, that grew for as long as the program ran. It's now an explicit,
+bounded aoc2024.memo.Memo keyed by stone and blinks left, and both parts
+share the same one as a cache intermediate, so the results from Part 1's 25
+blinks are reused for the last 25 of Part 2's 75, whether solve() or the
+runner calls the parts. The memo is only shared within a run, never written
+to the cache.
 """
 
-def blink(stone, n=0, n_max=25, memo={}):
+from aoc2024 import cache
+from aoc2024.inputs import as_text, map_input
+from aoc2024.memo import Memo, pack
+
+
+# The blinks left are kept in the low bits of a memo key.
+BLINK_BITS = 8
+# Plenty for the real inputs, while keeping the memo bounded for any input.
+MEMO_SIZE = 2**18
+
+
+def blink(stone, n, memo):
     """
-    Returns the total number of stones that a stone at the n-th blink will 
-    yield by the (n_max)-th blink. Memoized by stone and blink iteration.
+    Returns the total number of stones that a stone will have become after n
+    more blinks. Memoized by stone and blinks left.
     """
-    # Hash results by stone and blink iteration.
-    key = (stone, n)
-    
     # Base case.
-    if n == n_max:
+    if n == 0:
         return 1
-    elif key in memo:
-        return memo[key]
-    
+
+    # Hash results by stone and blinks left.
+    key = pack(stone, n, BLINK_BITS)
+    total = memo.get(key)
+    if total is not None:
+        return total
+
     # Blink rules, in order of priority.
     if stone == 0:
-        memo[key] = blink(1, n + 1, n_max, memo)
+        total = blink(1, n - 1, memo)
     elif len(str(stone)) % 2 == 0:
         s = str(stone)
         midpoint = len(s) // 2
         left, right = s[:midpoint], s[midpoint:]
-        memo[key] = blink(int(left), n + 1, n_max, memo) + \
-            blink(int(right), n + 1, n_max, memo)
+        total = blink(int(left), n - 1, memo) + blink(int(right), n - 1, memo)
     else:
-        memo[key] = blink(stone * 2024, n + 1, n_max, memo)
+        total = blink(stone * 2024, n - 1, memo)
+
+    return memo.put(key, total)
+
+
+def parse(data):
+    # It's one short line, which isn't worth loading NumPy for.
+    return [int(stone) for stone in as_text(data).split()]
+
+
+def shared_memo():
+    """
+    Returns the blink memo. Keyed by blinks left, Part 1's results are part
+    of Part 2's, so both parts share it within a run.
+    """
+    return cache.intermediate("blink memo", lambda: Memo(MEMO_SIZE), keep=False)
+
+
+def count_stones(stones, n_blinks, memo=None):
+    if n_blinks >= 2**BLINK_BITS:
+        raise ValueError(f"Can't blink {n_blinks} times, only up to "
+                         f"{2**BLINK_BITS - 1}")
+    if memo is None:
+        memo = shared_memo()
+    total = sum(blink(stone, n_blinks, memo) for stone in stones)
+    memo.report("blink memo")
+    return total
+
+
+def part1(stones, memo=None):
+    return count_stones(stones, 25, memo)
+
 
-    return memo[key]
+def part2(stones, memo=None):
+    return count_stones(stones, 75, memo)
 
 
-with open("../_tests/day11.txt") as f:
-    stones = list(map(int, f.read().split()))
+def solve(source=None):
+    stones = parse(map_input(source, day=11))
+    with cache.shared():
+        return part1(stones), part2(stones)
 
-# PART 1.
-n_blinks = 25
-memo = {}
-total_stones = sum(blink(stone, 0, n_blinks, memo) for stone in stones)
-print(f'PART 1\tAfter {n_blinks} blinks there are: {total_stones} stones')
 
-# PART 2.
-n_blinks = 75
-memo.clear()
-total_stones = sum(blink(stone, 0, n_blinks, memo) for stone in stones)
-print(f'PART 2\tAfter {n_blinks} blinks there are: {total_stones} stones')
+if __name__ == "__main__":
+    total_stones_1, total_stones_2 = solve()
+    print(f'PART 1\tAfter 25 blinks there are: {total_stones_1} stones')
+    print(f'PART 2\tAfter 75 blinks there are: {total_stones_2} stones')
@@ -2,56 +2,80 @@
 Advent of Code 2024
 Day 13: Claw Contraption
 
-This problem reduces to linear systems of two equations in two unknowns, and 
-we have to determine which systems have integer solutions. Let `a` be the 
-number of times you push button A, `b` the number of times you push button B. 
+This problem reduces to linear systems of two equations in two unknowns, and
+we have to determine which systems have integer solutions. Let `a` be the
+number of times you push button A, `b` the number of times you push button B.
 Given the prize position `p` = (x_p, x_p), we seek (a, b) such that
 
     a * x_a + b * x_b = x_p
     a * y_a + b * y_b = y_p
 
-where (x_i, y_i) is the movement for each push of button i. We can solve this 
+where (x_i, y_i) is the movement for each push of button i. We can solve this
 algebraically, then check if (a, b) are both integers.
+
+By Cramer's rule, a and b are ratios of determinants, and moving the prize
+(as Part 2 does) only shifts their numerators by a multiple of the offset. So
+the terms are worked out once, for all the machines at once, and each part
+just adds its offset and checks divisibility exactly in integers. (Floats
+lose the answer for machines whose buttons are nearly parallel.)
 """
 
-with open("../_tests/day13.txt") as f:
-    lines = f.read().splitlines()
-
-parse = lambda s: int(''.join([x for x in s if x.isdigit()]))
-
-tol = 1e-3
-tokens_1 = 0
-tokens_2 = 0
-for i in range(0, len(lines), 4):
-    # A button.
-    a_line = lines[i].split()
-    ax, ay = parse(a_line[2]), parse(a_line[3])
-
-    # B button.
-    b_line = lines[i+1].split()
-    bx, by = parse(b_line[2]), parse(b_line[3])
-    
-    # Prize position.
-    prize_line = lines[i+2].split()
-    px, py = parse(prize_line[1]), parse(prize_line[2])
-
-    # PART 1.
-    a = (py - px * by / bx) / (ay - ax * by / bx)
-    b = (px - a * ax) / bx
-    
-    # Integer solutions might be off of a whole number within tolerance due to
-    # floating point error.
-    if abs(a - round(a)) < tol and abs(b - round(b)) < tol:
-        tokens_1 += 3 * a + b
-
-    # PART 2.
-    px += 10000000000000
-    py += 10000000000000
-    a = (py - px * by / bx) / (ay - ax * by / bx)
-    b = (px - a * ax) / bx
-    
-    if abs(a - round(a)) < tol and abs(b - round(b)) < tol:
-        tokens_2 += 3 * a + b
-
-print(f'Number of tokens: {int(tokens_1)}')
-print(f'Number of tokens: {int(tokens_2)}')
+from aoc2024 import cache
+from aoc2024.inputs import ints, map_input
+
+
+def parse(data):
+    # Each machine is a row of the A button, the B button, and the prize
+    # position: (ax, ay, bx, by, px, py).
+    return ints(data).reshape(-1, 6)
+
+
+def linear_terms(machines):
+    """
+    Returns the determinant of every machine's system, and the constant and
+    offset coefficient of the numerators of a and b. Both parts need them, so
+    they're kept in the cache.
+    """
+    def terms():
+        ax, ay, bx, by, px, py = machines.T
+        return (ax * by - ay * bx,
+                px * by - py * bx, by - bx,
+                ax * py - ay * px, ax - ay)
+
+    return cache.intermediate("terms", terms)
+
+
+def count_tokens(machines, offset=0):
+    det, a_const, a_coef, b_const, b_coef = linear_terms(machines)
+    a = a_const + offset * a_coef
+    b = b_const + offset * b_coef
+    # Machines whose buttons are parallel have no unique solution, and
+    # would divide by zero.
+    unique = det != 0
+    det, a, b = det[unique], a[unique], b[unique]
+    # Only whole, non-negative numbers of presses win the prize. The signs
+    # are compared rather than multiplied, which could overflow.
+    wins = ((a % det == 0) & (b % det == 0) &
+            (((a >= 0) == (det > 0)) | (a == 0)) &
+            (((b >= 0) == (det > 0)) | (b == 0)))
+    return int(((3 * a[wins] + b[wins]) // det[wins]).sum())
+
+
+def part1(machines):
+    return count_tokens(machines)
+
+
+def part2(machines):
+    return count_tokens(machines, offset=10000000000000)
+
+
+def solve(source=None):
+    machines = parse(map_input(source, day=13))
+    with cache.shared():
+        return part1(machines), part2(machines)
+
+
+if __name__ == "__main__":
+    tokens_1, tokens_2 = solve()
+    print(f'Number of tokens: {tokens_1}')
+    print(f'Number of tokens: {tokens_2}')
@@ -2,82 +2,80 @@
 Advent of Code 2024
 Day 15: Warehouse Woes
 
-The logic for Part 1 was clear but tedious to implement. I was tripped up by 
+The logic for Part 1 was clear but tedious to implement. I was tripped up by
 the edge case of pushing a series of boxes into a wall.
 
-Part 2 to come... I didn't get to finish either part on time because I was 
+Part 2 to come... I didn't get to finish either part on time because I was
 sick this day :/
 """
 
-import numpy as np
-
-
-def is_box(x, y):
-    return warehouse[x,y] == 'O'
-
-
-def is_empty(x, y):
-    return warehouse[x,y] == '.'
-
-
-with open("../_tests/day15.txt") as f:
-    lines = f.read().splitlines()
-
-warehouse = []
-instructions = []
-reading_instructions = False
-for line in lines:
-    if not line:
-        reading_instructions = True
-    elif not reading_instructions:
-        warehouse.append(list(line))
-    else:
-        instructions.append(line)
-
-warehouse = np.array(warehouse)
-dims = warehouse.shape
-instructions = ''.join(instructions)
-
-# Use (y, x) ordering for NumPy arrays.
-directions = {
-    '<': np.array([0, -1]),
-    '^': np.array([-1, 0]),
-    '>': np.array([0, 1]),
-    'v': np.array([1, 0])
-}
-
-current_position = np.argmax(warehouse == '@')
-current_position = np.unravel_index(current_position, dims)
-
-for instruction in instructions:
-    move = directions[instruction]
-    next_position = current_position + move
-    is_box = warehouse[*next_position] == 'O'
-    is_empty = warehouse[*next_position] == '.'
-    if is_box:
-        new_box_position = next_position + move
-        box_q = [new_box_position]
-        # If the next space isn't empty or a wall, it's a box.
-        while warehouse[*new_box_position] not in ".#":
-            new_box_position = new_box_position + move
-            box_q.append(new_box_position)
-        # If the last queued space is a wall, then there's no space to push.
-        if box_q and warehouse[*box_q[-1]] == '#': continue
-        # Otherwise, push all the queued boxes forward one space.
-        while box_q:
-            warehouse[*(box_q.pop())] = 'O'
-        warehouse[*next_position] = '@'
-        warehouse[*current_position] = '.'
-        current_position = next_position
-    elif is_empty:
-        warehouse[*next_position] = '@'
-        warehouse[*current_position] = '.'
-        current_position = next_position
-
-boxes = np.argwhere(warehouse == 'O').tolist()
-gps_sum = 0
-for box in boxes:
-    x, y = box
-    gps_sum += 100 * x + y
-
-print(f'PART 1\tGPS coordinates sum: {gps_sum}')
+from aoc2024.grid import Grid
+from aoc2024.inputs import as_bytes, map_input, sections
+from aoc2024.lazy import lazy_import
+
+np = lazy_import("numpy")
+
+
+BOX = ord('O')
+EMPTY = ord('.')
+ROBOT = ord('@')
+WALL = ord('#')
+
+
+def parse(data):
+    warehouse, instructions = sections(data)[:2]
+    instructions = as_bytes(instructions)
+    instructions = instructions[instructions != ord('\n')].tobytes().decode()
+    return Grid.from_text(warehouse), instructions
+
+
+def part1(data):
+    warehouse, instructions = data
+    tiles = bytearray(warehouse.tobytes())
+    # Each move is a flat offset; the warehouse is walled in, so the robot
+    # never leaves it.
+    directions = dict(zip("^>v<", warehouse.offsets))
+
+    current_position = warehouse.first('@')
+
+    for instruction in instructions:
+        move = directions[instruction]
+        next_position = current_position + move
+        is_box = tiles[next_position] == BOX
+        is_empty = tiles[next_position] == EMPTY
+        if is_box:
+            new_box_position = next_position + move
+            box_q = [new_box_position]
+            # If the next space isn't empty or a wall, it's a box.
+            while tiles[new_box_position] not in b".#":
+                new_box_position = new_box_position + move
+                box_q.append(new_box_position)
+            # If the last queued space is a wall, then there's no space to
+            # push.
+            if box_q and tiles[box_q[-1]] == WALL: continue
+            # Otherwise, push all the queued boxes forward one space.
+            while box_q:
+                tiles[box_q.pop()] = BOX
+            tiles[next_position] = ROBOT
+            tiles[current_position] = EMPTY
+            current_position = next_position
+        elif is_empty:
+            tiles[next_position] = ROBOT
+            tiles[current_position] = EMPTY
+            current_position = next_position
+
+    boxes = np.flatnonzero(np.frombuffer(tiles, dtype=np.uint8) == BOX)
+    x, y = warehouse.positions(boxes)
+    gps_sum = (100 * x + y).sum()
+
+    return gps_sum
+
+
+def solve(source=None):
+    data = parse(map_input(source, day=15))
+    return part1(data), None
+
+
+if __name__ == "__main__":
+    gps_sum, _ = solve()
+    print(f'PART 1\tGPS coordinates sum: {gps_sum}')
@@ -2,88 +2,162 @@
 Advent of Code 2024
 Day 16: Reindeer Maze
 
-Both parts require just Dijkstra's algorithm but with a clever kind of graph 
-to be able to include turn costs. I define a state according to the (NumPy) 
-axis that the reindeer is facing within the maze: North-south (axis 0) or 
-east-west (axis 1). Then every tile in the maze contributes two nodes: One for 
-if the reindeer is passing through it north-south, one if east-west. The cost 
-of moving from one tile to the next along the same axis is 1, and it's 1001 
-to move and change orientation from one axis to the other. Dijkstra's 
-algorithm quickly gives the shortest, i.e., lowest-scoring, path with these 
+Both parts require just Dijkstra's algorithm but with a clever kind of graph
+to be able to include turn costs. I define a state according to the (NumPy)
+axis that the reindeer is facing within the maze: North-south (axis 0) or
+east-west (axis 1). Then every tile in the maze contributes two nodes: One for
+if the reindeer is passing through it north-south, one if east-west. The cost
+of moving from one tile to the next along the same axis is 1, and it's 1001
+to move and change orientation from one axis to the other. Dijkstra's
+algorithm quickly gives the shortest, i.e., lowest-scoring, path with these
 edge weights.
+
+The graph doesn't need to be built, though: aoc2024.search runs Dijkstra's
+algorithm straight on the maze tiles, with the axis as the layer of each
+state. For Part 2, the shortest paths are traced back from the end through
+every state whose distance from the start is exactly one move's cost less
+than the next one's. The NetworkX version is kept as the reference that the
+search is checked against.
 """
 
-import numpy as np
-import networkx as nx
+from aoc2024 import cache
+from aoc2024.coords import KeySet
+from aoc2024.grid import Grid
+from aoc2024.inputs import map_input
+from aoc2024.instrument import phase
+from aoc2024.lazy import lazy_import
+from aoc2024.search import UNREACHED, dijkstra, shortest_path_states
+
+np = lazy_import("numpy")
+nx = lazy_import("networkx")
+
+
+END = ord('E')
+
+
+def parse(text):
+    return Grid.from_text(text, pad=1)
+
+
+def moves(maze):
+    """
+    Returns the moves for the search, with a state's layer being the axis
+    that the reindeer is passing through its tile along.
+    """
+    north, east, south, west = maze.offsets
+    # Moving NS keeps to axis 0, moving EW keeps to axis 1. Moving off the
+    # axis means turning first.
+    axes = [(north, south), (east, west)]
+    return [[(offset, axis, 1 if axis == facing else 1001)
+             for axis, offsets in enumerate(axes) for offset in offsets]
+            for facing in (0, 1)]
+
+
+def distances(maze):
+    """
+    Returns the distances from the start to every state. Both parts need
+    them, so they're kept in the cache.
+    """
+    n = maze.flat.size
+    # The maze starts facing along the EW axis.
+    start = n + maze.first('S')
+    end = maze.first('E')
+
+    def search():
+        # Walls can't be entered, and the start can't be re-entered. The end
+        # only has moves in.
+        with phase("search"):
+            dist, _ = dijkstra(maze.mask(".E"), maze.mask(".S"), moves(maze),
+                               [start], targets=[end, n + end])
+        return dist
+
+    return cache.intermediate("distances", search)
 
 
-def get_neighbors(x, y, x_max, y_max):
-    """Returns a list of points 4-adjacent to the point (x, y)."""
-    neighbors = []
-    if y < y_max - 1:
-        neighbors.append((x, y + 1))
-    if x < x_max - 1:
-        neighbors.append((x + 1, y))
-    if y > 0:
-        neighbors.append((x, y - 1))
-    if x > 0:
-        neighbors.append((x - 1, y))
-    
-    return neighbors
+def find_shortest(maze, dist):
+    """
+    Returns the end state of the overall shortest path and that path's
+    length.
+    """
+    # The end tile can be reached from either the NS or EW axes. The overall
+    # shortest path is the shorter of the two shortest paths ending along each
+    # axis.
+    end = maze.first('E')
+    ends = [end, maze.flat.size + end]
+    path_length, end_state = min((int(dist[state]), state) for state in ends
+                                 if dist[state] != UNREACHED)
+    return end_state, path_length
 
 
-with open("../_tests/day16.txt") as f:
-    maze = np.array([list(line) for line in f.read().splitlines()])
-    dims = maze.shape
+def part1(maze):
+    _, lowest_score = find_shortest(maze, distances(maze))
+    return lowest_score
 
-# PART 1.
-G = nx.DiGraph()
-for tile in np.ndindex(dims):
+
+def part2(maze):
+    dist = distances(maze)
+    end, _ = find_shortest(maze, dist)
+    with phase("trace paths"):
+        states = shortest_path_states(dist, maze.mask(".S"), moves(maze), [end])
+    tiles = states % maze.flat.size
+    return len(np.unique(tiles))
+
+
+def solve(source=None):
+    maze = parse(map_input(source, day=16))
+    with cache.shared():
+        return part1(maze), part2(maze)
+
+
+# Reference solution with a NetworkX graph. Nodes are packed into ints the
+# same way as the search's states, axis * len(maze) + tile.
+def build_graph(maze):
+    tiles = maze.tobytes()
+    n = len(tiles)
+    north, east, south, west = maze.offsets
+    G = nx.DiGraph()
     # Skip the maze walls.
-    if maze[*tile] == '#': continue
-    # Add the end tile as nodes with only in-edges.
-    elif maze[*tile] == 'E':
-        G.add_node((tile, 0))
-        G.add_node((tile, 1))
-    # All tiles contribute two nodes, one for each axis that the reindeer can 
-    # be passing through it along.
-    else:
-        G.add_node((tile, 0))
-        G.add_node((tile, 1))
-        neighbors = get_neighbors(*tile, *dims)
-        neighbors = [x for x in neighbors if maze[*x] in ".E"]
-        for neighbor in neighbors:
-            dx = abs(tile[0] - neighbor[0])
-            dy = abs(tile[1] - neighbor[1])
-            # No change in axis 0, therefore moving EW.
-            if dx == 0:
-                G.add_edge((tile, 1), (neighbor, 1), weight=1)
-                G.add_edge((tile, 0), (neighbor, 1), weight=1001)
-            # No chnage in axis 1, therefore moving NS.
-            elif dy == 0:
-                G.add_edge((tile, 0), (neighbor, 0), weight=1)
-                G.add_edge((tile, 1), (neighbor, 0), weight=1001)
-
-# The maze starts facing along the EW axis.
-start = np.argmax(maze == 'S')
-start = np.unravel_index(start, dims)
-start = (start, 1)
-
-# The end tile can be reached from either the NS or EW axes. The overall 
-# shortest path is the shorter of the two shortest paths ending along each 
-# axis.
-end = np.argmax(maze == 'E')
-end = np.unravel_index(end, dims)
-path_lengths = []
-for end_dir in [0, 1]:
-    path_length = nx.shortest_path_length(G, start, (end, end_dir), weight="weight")
-    path_lengths.append(path_length)
-end_dir = path_lengths.index(min(path_lengths))
-
-print(f'PART 1\tLowest possible score: {path_lengths[end_dir]}')
-
-# PART 2.
-paths = nx.all_shortest_paths(G, start, (end, end_dir), weight="weight")
-tiles = set(tile for path in paths for tile, _ in path)
-
-print(f'PART 2\tNumber of tiles: {len(tiles)}')
+    for tile in maze.find(".SE").tolist():
+        # All tiles contribute two nodes, one for each axis that the reindeer
+        # can be passing through it along.
+        G.add_node(tile)
+        G.add_node(n + tile)
+        # Add the end tile as nodes with only in-edges.
+        if tiles[tile] == END: continue
+        # Moving NS keeps to axis 0, moving EW keeps to axis 1.
+        for axis, offsets in [(0, (north, south)), (1, (east, west))]:
+            for offset in offsets:
+                neighbor = tile + offset
+                if tiles[neighbor] not in b".E": continue
+                G.add_edge(axis * n + tile, axis * n + neighbor, weight=1)
+                G.add_edge((1 - axis) * n + tile, axis * n + neighbor,
+                           weight=1001)
+
+    return G
+
+
+def solve_with_networkx(source=None):
+    maze = parse(map_input(source, day=16))
+    G = build_graph(maze)
+    n = maze.flat.size
+    start = n + maze.first('S')
+    end = maze.first('E')
+    path_lengths = [nx.shortest_path_length(G, start, end_dir * n + end,
+                                            weight="weight")
+                    for end_dir in [0, 1]]
+    end_dir = path_lengths.index(min(path_lengths))
+    paths = nx.all_shortest_paths(G, start, end_dir * n + end, weight="weight")
+    tiles = KeySet(n)
+    for path in paths:
+        tiles.add_many(np.array(path) % n)
+    return path_lengths[end_dir], len(tiles)
+
+
+# For `python -m aoc2024 check`, reference first.
+ENGINES = {"networkx": solve_with_networkx, "search": solve}
+
+
+if __name__ == "__main__":
+    lowest_score, tile_count = solve()
+    print(f'PART 1\tLowest possible score: {lowest_score}')
+    print(f'PART 2\tNumber of tiles: {tile_count}')
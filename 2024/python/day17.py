@@ -2,18 +2,21 @@
 Advent of Code 2024
 Day 17: Chronospatial Computer
 
-I like the object-oriented approach for Part 1. It makes processing 
+I like the object-oriented approach for Part 1. It makes processing
 instructions look natural.
 
-For Part 2, I tried the brute-force solution of initializing register A to 0, 
-processing the instructions as in Part 1, and comparing the output values to 
-the program; as soon as they don't match, break and increment the register. 
-This got me nowhere (and I wasn't willing to let this run overnight, even 
+For Part 2, I tried the brute-force solution of initializing register A to 0,
+processing the instructions as in Part 1, and comparing the output values to
+the program; as soon as they don't match, break and increment the register.
+This got me nowhere (and I wasn't willing to let this run overnight, even
 though this *should* work).
 
-I want to come back to this and think about reverse engineering the program. 
+I want to come back to this and think about reverse engineering the program.
 """
 
+from aoc2024.inputs import as_text, map_input
+
+
 class Computer:
     def __init__(self, register_A, register_B, register_C):
         self.pointer = 0
@@ -83,29 +86,42 @@ class Computer:
         self.pointer += 2
 
 
-with open("../_tests/day17.txt") as f:
-    lines = f.readlines()
-
-# PART 1.
-# Initialize register values.
-register_A = int(lines[0].split()[-1])
-register_B = int(lines[1].split()[-1])
-register_C = int(lines[2].split()[-1])
-
-# Read program instructions.
-program = lines[-1].split()[-1]
-program = [int(x) for x in program.split(',')]
-
-# Process instructions until the pointer is past the last instruction.
-computer = Computer(register_A, register_B, register_C)
-output = []
-while 0 <= computer.pointer < len(program):
-    opcode = program[computer.pointer]
-    operand = program[computer.pointer+1]
-    out_val = computer.instructions[opcode](operand)
-    # Store results from the `out` instruction.
-    if out_val is not None:
-        output.append(out_val)
-
-s = ','.join(map(str, output))
-print(f'PART 1\tProgram output: {s}')
+def parse(data):
+    # Registers can outgrow an int64, so these are parsed as text.
+    lines = as_text(data).splitlines()
+    # Initialize register values.
+    register_A = int(lines[0].split()[-1])
+    register_B = int(lines[1].split()[-1])
+    register_C = int(lines[2].split()[-1])
+
+    # Read program instructions.
+    program = lines[-1].split()[-1]
+    program = [int(x) for x in program.split(',')]
+
+    return (register_A, register_B, register_C), program
+
+
+def part1(data):
+    registers, program = data
+    # Process instructions until the pointer is past the last instruction.
+    computer = Computer(*registers)
+    output = []
+    while 0 <= computer.pointer < len(program):
+        opcode = program[computer.pointer]
+        operand = program[computer.pointer+1]
+        out_val = computer.instructions[opcode](operand)
+        # Store results from the `out` instruction.
+        if out_val is not None:
+            output.append(out_val)
+
+    return ','.join(map(str, output))
+
+
+def solve(source=None):
+    data = parse(map_input(source, day=17))
+    return part1(data), None
+
+
+if __name__ == "__main__":
+    s, _ = solve()
+    print(f'PART 1\tProgram output: {s}')
@@ -4,91 +4,151 @@ Day 18: RAM Run
 
 Part 1 was straightforward with Dijkstra's algorithm.
 
-I originally solved Part 2 via brute force: Let each byte fall and find the 
-(potentially new) Dijkstra path until no path is possible. This runs under 
-30 s, which I improved after realizing that the shortest path won't change 
-until a byte falls in one of its spaces. Find the first such byte, let all 
-bytes through that one fall, and then try to find the Dijkstra path. Repeat 
+I originally solved Part 2 via brute force: Let each byte fall and find the
+(potentially new) Dijkstra path until no path is possible. This runs under
+30 s, which I improved after realizing that the shortest path won't change
+until a byte falls in one of its spaces. Find the first such byte, let all
+bytes through that one fall, and then try to find the Dijkstra path. Repeat
 until no path is possible.
+
+Both parts now search the memory grid directly with aoc2024.search. Part 1 is
+a breadth-first search, since every step costs the same. Part 2 no longer
+repeats the search at all: label every space with the index of the byte that
+falls there, and the blocking byte is the one on the path whose earliest
+falling byte falls as late as possible, which a single flood fill finds. The
+NetworkX version is kept as the reference that these are checked against.
 """
 
-import networkx as nx
-import numpy as np
-
-
-def get_neighbors(x, y, x_max, y_max):
-    """Returns a list of points 4-adjacent to the point (x, y)."""
-    neighbors = []
-    if y < y_max - 1:
-        neighbors.append((x, y + 1))
-    if x < x_max - 1:
-        neighbors.append((x + 1, y))
-    if y > 0:
-        neighbors.append((x, y - 1))
-    if x > 0:
-        neighbors.append((x - 1, y))
-    
-    return neighbors
-
-
-def find_blocking_byte(path, last_k):
-    """Recursively finds the space with the blocking byte."""
-    indexes = []
-    for space in path:
-        try:
-            indexes.append(falling_bytes.index(space))
-        except ValueError:
-            continue
-    
+from aoc2024.coords import KeyMap
+from aoc2024.grid import Grid
+from aoc2024.inputs import ints, map_input
+from aoc2024.instrument import phase
+from aoc2024.lazy import lazy_import
+from aoc2024.search import bfs, bottleneck
+
+np = lazy_import("numpy")
+nx = lazy_import("networkx")
+
+
+CORRUPTED = ord('#')
+SAFE = ord('.')
+
+
+def parse(data):
+    # Bytes are given as x,y; keep them as (y, x) for row-major indexing.
+    falling_bytes = ints(data).reshape(-1, 2)[:,::-1]
+
+    # The memory space is N = 70 for the input and N = 6 for the test, which
+    # the bytes falling in the last row and column give away. The test lets
+    # k_max = 12 bytes fall for Part 1, the input 1024.
+    N = int(falling_bytes.max())
+    k_max = 12 if N <= 6 else min(1024, len(falling_bytes) // 2)
+
+    # The memory space is padded with a corrupted border, so every space has
+    # the same flat offsets to its neighbors and none of them is out of
+    # bounds.
+    memory = Grid.from_array(np.full((N + 1, N + 1), SAFE), pad=1, border=CORRUPTED)
+    falling_bytes = memory.index(falling_bytes[:,0], falling_bytes[:,1])
+
+    return memory, falling_bytes, k_max
+
+
+def part1(data):
+    memory, falling_bytes, k_max = data
+    N = memory.shape[0] - 1
+    tiles = memory.flat.copy()
+    tiles[falling_bytes[:k_max]] = CORRUPTED
+    end = memory.index(N, N)
+    with phase("search"):
+        dist, _ = bfs(tiles != CORRUPTED, memory.offsets, [memory.index(0, 0)], [end])
+    return int(dist[end])
+
+
+def part2(data):
+    memory, falling_bytes, _ = data
+    N = memory.shape[0] - 1
+    # Label each space with the index of the first byte to fall there, or
+    # with the number of bytes if none do. The corrupted border is -1.
+    fall_index = KeyMap.first_indexes(falling_bytes, memory.flat.size,
+                                      missing=len(falling_bytes))
+    fall_index[memory.flat == CORRUPTED] = -1
+    # After byte k falls, the exit can only be reached along paths whose
+    # spaces all have labels above k, so the index of the blocking byte is
+    # the best lowest label along any path.
+    with phase("search"):
+        index = bottleneck(fall_index.values, memory.offsets, memory.index(0, 0),
+                           memory.index(N, N))
+    return memory.position(falling_bytes[index])[::-1]
+
+
+def solve(source=None):
+    data = parse(map_input(source, day=18))
+    return part1(data), part2(data)
+
+
+# Reference solution with a NetworkX graph.
+def find_blocking_byte(G, path, last_k, falling_bytes, first_fall, start, end):
+    """
+    Recursively finds the index of the blocking byte. first_fall maps each
+    space to the index of the first byte to fall there.
+    """
+    indexes = [first_fall[space] for space in path if space in first_fall]
     indexes.sort()
     index = indexes[0]
     for k in range(last_k, index + 1):
         space = falling_bytes[k]
-        is_corrupted[*space] = True
         if space in G:
             G.remove_node(space)
-    
+
     try:
         path = nx.dijkstra_path(G, start, end)
         last_k = index
-        return find_blocking_byte(path, last_k)
+        return find_blocking_byte(G, path, last_k, falling_bytes, first_fall,
+                                  start, end)
     except nx.NetworkXNoPath:
-        return falling_bytes[index]
-
-
-with open("../_tests/day18.txt") as f:
-    lines = f.read().splitlines()
-
-falling_bytes = []
-for line in lines:
-    j, i = tuple(int(x) for x in line.split(','))
-    falling_bytes.append((i, j))
-
-# N = 70
-N = 6
-dims = (N + 1, N + 1)
-is_corrupted = np.zeros(dims, dtype='bool')
-start = (0, 0)
-end = (N, N)
-
-# PART 1.
-# k_max = 1024
-k_max = 12
-for k in range(k_max):
-    is_corrupted[*falling_bytes[k]] = True
-
-G = nx.Graph()
-for space in np.ndindex(dims):
-    if is_corrupted[*space]: continue
-    G.add_node(space)
-    neighbors = get_neighbors(*space, *dims)
-    for neighbor in neighbors:
-        if not is_corrupted[*neighbor]:
-            G.add_edge(space, neighbor)
-
-path = nx.dijkstra_path(G, start, end)
-print(f'PART 1\tLength of shortest path: {len(path) - 1}')
-
-# PART 2.
-blocking_byte = find_blocking_byte(path, k_max)
-print(f'PART 2\tLocation of blocking byte: {blocking_byte[::-1]}')
+        return index
+
+
+def build_graph(memory, falling_bytes, k_max):
+    """
+    Lets the first k_max bytes fall and returns the graph of the remaining
+    spaces.
+    """
+    tiles = bytearray(memory.tobytes())
+    for k in range(k_max):
+        tiles[falling_bytes[k]] = CORRUPTED
+
+    G = nx.Graph()
+    for space, tile in enumerate(tiles):
+        if tile == CORRUPTED: continue
+        G.add_node(space)
+        for offset in memory.offsets:
+            neighbor = space + offset
+            if tiles[neighbor] != CORRUPTED:
+                G.add_edge(space, neighbor)
+
+    return G
+
+
+def solve_with_networkx(source=None):
+    memory, falling_bytes, k_max = parse(map_input(source, day=18))
+    falling_bytes = falling_bytes.tolist()
+    N = memory.shape[0] - 1
+    start = memory.index(0, 0)
+    end = memory.index(N, N)
+    G = build_graph(memory, falling_bytes, k_max)
+    first_fall = KeyMap.first_indexes(falling_bytes, memory.flat.size)
+    path = nx.dijkstra_path(G, start, end)
+    index = find_blocking_byte(G, path, k_max, falling_bytes, first_fall,
+                               start, end)
+    return len(path) - 1, memory.position(falling_bytes[index])[::-1]
+
+
+# For `python -m aoc2024 check`, reference first.
+ENGINES = {"networkx": solve_with_networkx, "search": solve}
+
+
+if __name__ == "__main__":
+    path_length, blocking_byte = solve()
+    print(f'PART 1\tLength of shortest path: {path_length}')
+    print(f'PART 2\tLocation of blocking byte: {blocking_byte}')
@@ -0,0 +1,23 @@
+import day11
+from aoc2024 import cache
+from aoc2024.inputs import map_input
+from aoc2024.runner import run_day
+
+
+def test_part2_reuses_part1_memo():
+    result = run_day(11, record_counters=True)
+    assert result.answers == (55312, 65601038650482)
+
+    # On its own, Part 2 has to work out what Part 1 already had.
+    with cache.scope(cache.Scratch()):
+        day11.part2(day11.parse(map_input(None, day=11)))
+        alone = day11.shared_memo().stats()
+    part1, part2 = result.counters["part1"], result.counters["part2"]
+    assert part1["blink memo misses"] > 0
+    assert part2["blink memo misses"] < alone.misses
+
+
+def test_parts_alone_start_afresh():
+    stones = day11.parse(map_input(None, day=11))
+    assert day11.part1(stones) == 55312
+    assert day11.part2(stones) == 65601038650482
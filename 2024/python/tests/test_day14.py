@@ -0,0 +1,37 @@
+import numpy as np
+
+import day14
+from aoc2024 import generate
+from aoc2024.inputs import input_path
+
+
+def safety_factor(text, dims, t=100):
+    """Part 1 worked out robot by robot, on the given grid."""
+    m, n = dims
+    quadrants = [0] * 4
+    for line in text.split('\n'):
+        if not line.startswith("p="):
+            continue
+        (x, y), (dx, dy) = [map(int, half[2:].split(',')) for half in line.split()]
+        row, col = (y + dy * t) % m, (x + dx * t) % n
+        if row != m // 2 and col != n // 2:
+            quadrants[2 * (row > m // 2) + (col > n // 2)] += 1
+    return quadrants[0] * quadrants[1] * quadrants[2] * quadrants[3]
+
+
+def test_stored_input_is_the_test_grid():
+    assert day14.parse(input_path(14).read_bytes())[2] == day14.TEST_DIMS
+
+
+def test_generated_input_on_the_real_grid_has_no_header():
+    text = generate.generate(14, 200, seed=1)
+    assert text.startswith("p=")
+    assert day14.parse(text)[2] == day14.INPUT_DIMS
+
+
+def test_generated_input_on_another_grid():
+    dims = (31, 37)
+    text = ''.join(generate.day14(300, np.random.default_rng(2), dims=dims))
+    data = day14.parse(text)
+    assert data[2] == dims
+    assert day14.part1(data) == safety_factor(text, dims)
@@ -0,0 +1,37 @@
+import re
+
+import numpy as np
+import pytest
+
+from aoc2024 import inputs
+
+
+TEXT = """\
+p=0,4 v=3,-3 -12345678
+x--7 8-9 ---
+1234567890123 -1
+
+-42,17
+"""
+
+
+def reference(text):
+    found = [(int(m.group()), text.count('\n', 0, m.start()))
+             for m in re.finditer(r"-?\d+", text)]
+    return [value for value, _ in found], [line for _, line in found]
+
+
+@pytest.mark.parametrize("chunk", [1, 2, 3, 5, 8, 64, inputs.INTS_CHUNK])
+def test_ints_across_chunks(monkeypatch, chunk):
+    monkeypatch.setattr(inputs, "INTS_CHUNK", chunk)
+    values, line_numbers = inputs.ints(TEXT, lines=True)
+    expected_values, expected_lines = reference(TEXT)
+    assert values.tolist() == expected_values
+    assert line_numbers.tolist() == expected_lines
+    assert inputs.ints(TEXT).tolist() == expected_values
+
+
+def test_ints_of_nothing():
+    values, line_numbers = inputs.ints("", lines=True)
+    assert values.dtype == np.int64 and len(values) == 0
+    assert len(line_numbers) == 0
@@ -0,0 +1,24 @@
+import numpy as np
+
+from aoc2024.wordsearch import Occurrence, count_words, find_words
+
+
+def grid(text):
+    return np.array([list(line.encode()) for line in text.split()], dtype=np.uint8)
+
+
+def test_repeated_word_counted_once():
+    g = grid("AB\nBA")
+    # Across and down from the top A, and back and up from the bottom one.
+    assert count_words(g, ["AB"]) == {"AB": 4}
+    assert count_words(g, ["AB", "AB"]) == {"AB": 4}
+    assert sorted(find_words(g, ["AB", "AB"])) == sorted(find_words(g, ["AB"]))
+
+
+def test_words_in_all_directions():
+    g = grid("XMAS\nSAMX")
+    # MA reads across and down from the top M, and back and up from the
+    # bottom one.
+    assert count_words(g, ["XMAS", "MA"]) == {"XMAS": 2, "MA": 4}
+    assert set(find_words(g, ["XMAS"])) == {
+        Occurrence("XMAS", 0, 0, (0, 1)), Occurrence("XMAS", 1, 3, (0, -1))}